@@ -3,15 +3,26 @@ from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-import os, uvicorn
+import os, orjson, uvicorn
+from contextlib import asynccontextmanager
 from datetime import datetime
 from crew import ContentEngineCrew
 from tools.trending_fetcher import fetch_all_trending
-from tools.video_researcher import search_videos, select_and_host_video
+from tools.video_researcher import (
+    search_videos, select_and_host_video, select_and_host_videos, get_or_create_hosted_video,
+)
 from tools.shorts_rewriter import rewrite_for_shorts
 from tools.twitter_video_scanner import fetch_video_tweets
+from tools import twitter_video_scanner, video_researcher
 
-app = FastAPI(title="AJ Content Engine", description="Multi-Agent Autonomous Content Production System", version="3.2.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled HTTP clients held by the tool modules
+    await twitter_video_scanner.aclose()
+    await video_researcher.aclose()
+
+app = FastAPI(title="AJ Content Engine", description="Multi-Agent Autonomous Content Production System", version="3.2.0", lifespan=lifespan)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 templates = Jinja2Templates(directory="templates")
 campaigns = []
@@ -34,7 +45,8 @@ async def dashboard(request: Request):
 async def get_trending(page: int = 0):
     try:
         data = await fetch_all_trending(page=page)
-        return JSONResponse(data)
+        # Serialize straight to bytes with orjson instead of Starlette's json.dumps
+        return Response(content=orjson.dumps(data), media_type="application/json")
     except Exception as e:
         return JSONResponse({"error": str(e), "topics": [], "total": 0, "page": page, "has_more": False}, status_code=500)
 
@@ -219,6 +231,36 @@ async def video_select(request: Request):
     except Exception as e:
         return JSONResponse({"error": str(e), "status": "error"}, status_code=500)
 
+@app.post("/api/videos/select-batch")
+async def video_select_batch(request: Request):
+    """Download + host several selected videos concurrently."""
+    try:
+        body = await request.json()
+        videos = [
+            {"url": (v.get("url") or "").strip(), "download_url": (v.get("download_url") or "").strip()}
+            for v in body.get("videos") or [] if (v.get("url") or "").strip()
+        ]
+        if not videos:
+            return JSONResponse({"error": "At least one video URL is required"}, status_code=400)
+        if len(videos) > 8:
+            return JSONResponse({"error": "At most 8 videos per batch"}, status_code=400)
+        results = await select_and_host_videos(videos)
+        return JSONResponse({"results": results, "count": len(results)})
+    except Exception as e:
+        return JSONResponse({"error": str(e), "results": []}, status_code=500)
+
+@app.post("/api/videos/host-topic")
+async def video_host_topic(request: Request):
+    """Hosted video for a topic — reused if the topic was hosted recently."""
+    try:
+        body = await request.json()
+        topic = body.get("topic", "").strip()
+        if not topic:
+            return JSONResponse({"error": "Topic is required"}, status_code=400)
+        return JSONResponse(await get_or_create_hosted_video(topic))
+    except Exception as e:
+        return JSONResponse({"error": str(e), "status": "error"}, status_code=500)
+
 # ─── CAMPAIGN ENDPOINTS ───────────────────────────────────────────
 @app.post("/api/campaign/generate")
 async def generate_campaign(request: Request):
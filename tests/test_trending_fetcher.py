@@ -0,0 +1,46 @@
+"""AJ Content Engine — Trending fetcher tests"""
+import unittest
+
+from tools.trending_fetcher import Topic, _strip_html, categorize_topic
+
+
+class StripHtmlTest(unittest.TestCase):
+    def test_plain_text_untouched(self):
+        self.assertEqual(_strip_html("  plain text "), "plain text")
+
+    def test_tags_stripped_and_entities_decoded(self):
+        self.assertEqual(_strip_html("<p>Hi <b>there</b> &amp; you</p>"), "Hi there & you")
+
+    def test_script_and_cdata_dropped(self):
+        self.assertEqual(_strip_html("<script>x()</script><![CDATA[<p>A</p>]]>"), "A")
+
+    def test_escaped_text_is_kept(self):
+        self.assertEqual(_strip_html("<p>Use List&lt;String&gt; in Java</p>"), "Use List<String> in Java")
+        self.assertEqual(_strip_html("a &lt; b and c &gt; d"), "a < b and c > d")
+        self.assertEqual(_strip_html("Tom &amp;amp; Jerry"), "Tom &amp; Jerry")
+
+    def test_entity_encoded_markup_is_stripped(self):
+        self.assertEqual(_strip_html("&lt;p&gt;Hello &amp;amp; bye&lt;/p&gt;"), "Hello & bye")
+        self.assertEqual(_strip_html("&lt;script&gt;x()&lt;/script&gt;Body"), "Body")
+
+
+def _topic(title: str, source: str) -> Topic:
+    return Topic(title=title, url="u", snippet="", image=None, source=source,
+                 source_name=source, time_ago="1h", score=None)
+
+
+class CategorizeTopicTest(unittest.TestCase):
+    def test_query_category_wins(self):
+        self.assertEqual(categorize_topic(_topic("New model paper", "serper"), "breaking"), "breaking")
+
+    def test_community_sources_still_keyword_scanned(self):
+        self.assertEqual(categorize_topic(_topic("Show HN: open source tool", "hackernews")), "tools")
+        self.assertEqual(categorize_topic(_topic("New diffusion paper", "reddit")), "research")
+
+    def test_source_fallback_when_no_keyword_matches(self):
+        self.assertEqual(categorize_topic(_topic("Weekly thread", "twitter")), "community")
+        self.assertEqual(categorize_topic(_topic("Markets moved sharply", "rss")), "breaking")
+
+
+if __name__ == "__main__":
+    unittest.main()
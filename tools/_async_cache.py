@@ -0,0 +1,82 @@
+"""AJ Content Engine — Async TTL Cache
+Memoizes coroutine results for a fixed time window. The cache stores the
+in-flight future, not just the finished result, so concurrent callers with
+the same key share one upstream call instead of stampeding it.
+"""
+import time
+import asyncio
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+def async_ttl_cache(maxsize: int = 128, ttl: float = 300.0,
+                    key: Optional[Callable[..., Hashable]] = None,
+                    copy: Optional[Callable[[Any], Any]] = None):
+    """Decorate an `async def` with a TTL + LRU cache.
+
+    - `key` builds the cache key from the call args (default: args + kwargs).
+    - A call still in flight is joined even once its TTL has passed, so
+      `ttl=0` gives plain single-flight: concurrent identical calls share
+      one upstream call and nothing is reused after it finishes.
+    - Exceptions and empty results are not kept, so a failed or blank
+      upstream response is retried on the next call.
+    - Cached values are shared between callers — treat them as read-only,
+      or pass `copy` to hand every caller its own copy of the result.
+    """
+    def decorator(fn):
+        entries: OrderedDict = OrderedDict()  # key -> (expires_at, future)
+
+        async def _call(k, args, kwargs):
+            fut = asyncio.get_running_loop().create_future()
+            entries[k] = (time.monotonic() + ttl, fut)
+            entries.move_to_end(k)
+            while len(entries) > maxsize:
+                entries.popitem(last=False)
+            try:
+                result = await fn(*args, **kwargs)
+            except BaseException as e:
+                _discard(entries, k, fut)
+                if isinstance(e, asyncio.CancelledError):
+                    fut.cancel()
+                else:
+                    fut.set_exception(e)
+                    fut.exception()  # mark retrieved; waiters still re-raise it
+                raise
+            fut.set_result(result)
+            if not result:
+                _discard(entries, k, fut)
+            return result
+
+        async def _get(*args, **kwargs):
+            k = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            hit = entries.get(k)
+            if hit is not None and (hit[0] > time.monotonic() or not hit[1].done()):
+                entries.move_to_end(k)
+                fut = hit[1]
+                if fut.done():
+                    return fut.result()
+                try:
+                    return await asyncio.shield(fut)
+                except asyncio.CancelledError:
+                    if not fut.cancelled() or asyncio.current_task().cancelling():
+                        raise
+                    # The call we joined was cancelled by its own caller, not
+                    # by ours — run it ourselves below.
+            return await _call(k, args, kwargs)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            result = await _get(*args, **kwargs)
+            return copy(result) if copy is not None else result
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
+
+
+def _discard(entries: OrderedDict, k: Hashable, fut: asyncio.Future) -> None:
+    """Drop `k` only if it still points at this call's future."""
+    hit = entries.get(k)
+    if hit is not None and hit[1] is fut:
+        del entries[k]
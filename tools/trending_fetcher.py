@@ -2,15 +2,21 @@
 Sources: Serper API, Reddit, HackerNews, Product Hunt, ArXiv, Twitter/X, RSS Feeds
 Total: 7 sources feeding the Netflix-style discovery feed.
 """
-import os, asyncio, httpx, logging, xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
+import os, re, html, time, asyncio, httpx, orjson, logging, xml.etree.ElementTree as ET
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
 from typing import Optional
 
+from tools._async_cache import async_ttl_cache
+
 logger = logging.getLogger("trending")
 
 SERPER_KEY = os.getenv("SERPER_API_KEY", "")
 TWITTER_BEARER = os.getenv("TWITTER_BEARER_TOKEN", "")
 REDDIT_SUBS = ["artificial", "MachineLearning", "LocalLLaMA", "ChatGPT"]
+# API v2 recent search has no min_faves/min_retweets operators, so the
+# engagement floor has to be applied client-side.
+TWITTER_MIN_ENGAGEMENT = 10
 
 SERPER_QUERIES = {
     "breaking": ["AI news today", "artificial intelligence breaking news"],
@@ -33,11 +39,50 @@ RSS_FEEDS = [
 ]
 
 
+@dataclass(slots=True)
+class Topic:
+    """One feed item. Kept as a slotted object through fetch/dedup/sort and
+    only turned into a dict for the page that is actually returned."""
+    title: str
+    url: str
+    snippet: str
+    image: Optional[str]
+    source: str
+    source_name: str
+    time_ago: str
+    score: Optional[int]
+    category: str = ""
+    why_trending: str = ""
+    subreddit: Optional[str] = None
+
+
+def _ago(secs: float) -> str:
+    """Format an age in seconds as '3d ago' / '5h ago' / '12m ago'."""
+    secs = max(int(secs), 0)
+    if secs >= 86400:
+        return f"{secs // 86400}d ago"
+    if secs > 3600:
+        return f"{secs // 3600}h ago"
+    return f"{secs // 60}m ago"
+
+
+def _clip(text: str, limit: int) -> str:
+    """Truncate to `limit` chars, skipping the slice when it already fits."""
+    return text if len(text) <= limit else text[:limit]
+
+
+# Concurrent /trending requests that need the same upstream poll share the
+# call already in flight instead of issuing their own (ttl=0: no reuse once
+# it finishes).
+_single_flight = async_ttl_cache(maxsize=64, ttl=0)
+
+
 # ================================================================
 # SOURCE 1: SERPER API (Google News)
 # ================================================================
 
-async def fetch_serper(query: str, num: int = 8) -> list[dict]:
+@_single_flight
+async def fetch_serper(query: str, num: int = 8) -> list[Topic]:
     if not SERPER_KEY:
         return []
     try:
@@ -47,19 +92,19 @@ async def fetch_serper(query: str, num: int = 8) -> list[dict]:
                 headers={"X-API-KEY": SERPER_KEY, "Content-Type": "application/json"},
                 json={"q": query, "num": num, "tbs": "qdr:d"},
             )
-            data = resp.json()
+            data = orjson.loads(resp.content)
             results = []
             for item in data.get("news", []):
-                results.append({
-                    "title": item.get("title", ""),
-                    "url": item.get("link", ""),
-                    "snippet": item.get("snippet", ""),
-                    "image": item.get("imageUrl") or item.get("thumbnailUrl"),
-                    "source": "serper",
-                    "source_name": item.get("source", ""),
-                    "time_ago": item.get("date", "Recent"),
-                    "score": None,
-                })
+                results.append(Topic(
+                    title=item.get("title", ""),
+                    url=item.get("link", ""),
+                    snippet=item.get("snippet", ""),
+                    image=item.get("imageUrl") or item.get("thumbnailUrl"),
+                    source="serper",
+                    source_name=item.get("source", ""),
+                    time_ago=item.get("date", "Recent"),
+                    score=None,
+                ))
             return results
     except Exception as e:
         logger.error(f"Serper error for '{query}': {e}")
@@ -70,7 +115,8 @@ async def fetch_serper(query: str, num: int = 8) -> list[dict]:
 # SOURCE 2: REDDIT
 # ================================================================
 
-async def fetch_reddit(subreddit: str, limit: int = 10) -> list[dict]:
+@_single_flight
+async def fetch_reddit(subreddit: str, limit: int = 10) -> list[Topic]:
     try:
         async with httpx.AsyncClient(timeout=15) as client:
             resp = await client.get(
@@ -78,33 +124,28 @@ async def fetch_reddit(subreddit: str, limit: int = 10) -> list[dict]:
                 params={"limit": limit, "raw_json": 1},
                 headers={"User-Agent": "AJContentEngine/2.0"},
             )
-            data = resp.json()
+            data = orjson.loads(resp.content)
             results = []
+            now_ts = time.time()  # once per batch, not per post
             for post in data.get("data", {}).get("children", []):
                 d = post.get("data", {})
                 if d.get("stickied"):
                     continue
                 created = d.get("created_utc", 0)
-                delta = datetime.utcnow() - datetime.utcfromtimestamp(created) if created else timedelta(0)
-                if delta.days > 0:
-                    time_ago = f"{delta.days}d ago"
-                elif delta.seconds > 3600:
-                    time_ago = f"{delta.seconds // 3600}h ago"
-                else:
-                    time_ago = f"{delta.seconds // 60}m ago"
+                time_ago = _ago(now_ts - created if created else 0)
                 thumb = d.get("thumbnail")
                 image = thumb if thumb and thumb.startswith("http") else None
-                results.append({
-                    "title": d.get("title", ""),
-                    "url": f"https://reddit.com{d.get('permalink', '')}",
-                    "snippet": (d.get("selftext") or "")[:200],
-                    "image": image,
-                    "source": "reddit",
-                    "source_name": f"r/{subreddit}",
-                    "subreddit": subreddit,
-                    "time_ago": time_ago,
-                    "score": d.get("score", 0),
-                })
+                results.append(Topic(
+                    title=d.get("title", ""),
+                    url=f"https://reddit.com{d.get('permalink', '')}",
+                    snippet=_clip(d.get("selftext") or "", 200),
+                    image=image,
+                    source="reddit",
+                    source_name=f"r/{subreddit}",
+                    subreddit=subreddit,
+                    time_ago=time_ago,
+                    score=d.get("score", 0),
+                ))
             return results
     except Exception as e:
         logger.error(f"Reddit error for r/{subreddit}: {e}")
@@ -115,7 +156,8 @@ async def fetch_reddit(subreddit: str, limit: int = 10) -> list[dict]:
 # SOURCE 3: HACKERNEWS
 # ================================================================
 
-async def fetch_hackernews(limit: int = 10) -> list[dict]:
+@_single_flight
+async def fetch_hackernews(limit: int = 10) -> list[Topic]:
     try:
         async with httpx.AsyncClient(timeout=15) as client:
             resp = await client.get(
@@ -127,31 +169,26 @@ async def fetch_hackernews(limit: int = 10) -> list[dict]:
                     "hitsPerPage": limit,
                 },
             )
-            data = resp.json()
+            data = orjson.loads(resp.content)
             results = []
+            now_utc = datetime.now(timezone.utc)
             for hit in data.get("hits", []):
                 created = hit.get("created_at", "")
                 try:
-                    dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                    delta = datetime.now(dt.tzinfo) - dt
-                    if delta.days > 0:
-                        time_ago = f"{delta.days}d ago"
-                    elif delta.seconds > 3600:
-                        time_ago = f"{delta.seconds // 3600}h ago"
-                    else:
-                        time_ago = f"{delta.seconds // 60}m ago"
+                    # 3.11's fromisoformat accepts the trailing "Z" directly
+                    time_ago = _ago((now_utc - datetime.fromisoformat(created)).total_seconds())
                 except Exception:
                     time_ago = "Recent"
-                results.append({
-                    "title": hit.get("title", ""),
-                    "url": hit.get("url") or f"https://news.ycombinator.com/item?id={hit.get('objectID')}",
-                    "snippet": "",
-                    "image": None,
-                    "source": "hackernews",
-                    "source_name": "Hacker News",
-                    "time_ago": time_ago,
-                    "score": hit.get("points", 0),
-                })
+                results.append(Topic(
+                    title=hit.get("title", ""),
+                    url=hit.get("url") or f"https://news.ycombinator.com/item?id={hit.get('objectID')}",
+                    snippet="",
+                    image=None,
+                    source="hackernews",
+                    source_name="Hacker News",
+                    time_ago=time_ago,
+                    score=hit.get("points", 0),
+                ))
             return results
     except Exception as e:
         logger.error(f"HackerNews error: {e}")
@@ -162,7 +199,8 @@ async def fetch_hackernews(limit: int = 10) -> list[dict]:
 # SOURCE 4: PRODUCT HUNT (daily top AI products)
 # ================================================================
 
-async def fetch_producthunt(limit: int = 10) -> list[dict]:
+@_single_flight
+async def fetch_producthunt(limit: int = 10) -> list[Topic]:
     """Fetch today's top AI products from Product Hunt via their public feed."""
     try:
         async with httpx.AsyncClient(timeout=15) as client:
@@ -190,16 +228,16 @@ async def fetch_producthunt(limit: int = 10) -> list[dict]:
                                "copilot", "assistant", "language model", "diffusion", "transformer"]
                 if not any(kw in text for kw in ai_keywords):
                     continue
-                results.append({
-                    "title": title,
-                    "url": url,
-                    "snippet": summary[:200] if summary else "",
-                    "image": None,
-                    "source": "producthunt",
-                    "source_name": "Product Hunt",
-                    "time_ago": "Today",
-                    "score": None,
-                })
+                results.append(Topic(
+                    title=title,
+                    url=url,
+                    snippet=_clip(summary, 200) if summary else "",
+                    image=None,
+                    source="producthunt",
+                    source_name="Product Hunt",
+                    time_ago="Today",
+                    score=None,
+                ))
             return results
     except Exception as e:
         logger.error(f"Product Hunt error: {e}")
@@ -210,7 +248,8 @@ async def fetch_producthunt(limit: int = 10) -> list[dict]:
 # SOURCE 5: ARXIV (latest AI research papers)
 # ================================================================
 
-async def fetch_arxiv(limit: int = 10) -> list[dict]:
+@_single_flight
+async def fetch_arxiv(limit: int = 10) -> list[Topic]:
     """Fetch latest AI papers from ArXiv API."""
     try:
         async with httpx.AsyncClient(timeout=20) as client:
@@ -228,7 +267,7 @@ async def fetch_arxiv(limit: int = 10) -> list[dict]:
             ns = {"atom": "http://www.w3.org/2005/Atom"}
             for entry in root.findall("atom:entry", ns):
                 title = entry.findtext("atom:title", "", ns).strip().replace("\n", " ")
-                summary = entry.findtext("atom:summary", "", ns).strip().replace("\n", " ")[:200]
+                summary = _clip(entry.findtext("atom:summary", "", ns).strip().replace("\n", " "), 200)
                 link = ""
                 for l in entry.findall("atom:link", ns):
                     if l.get("type") == "text/html":
@@ -249,16 +288,16 @@ async def fetch_arxiv(limit: int = 10) -> list[dict]:
                 author_str = ", ".join(authors[:3])
                 if len(authors) > 3:
                     author_str += f" +{len(authors)-3} more"
-                results.append({
-                    "title": title,
-                    "url": link,
-                    "snippet": summary,
-                    "image": None,
-                    "source": "arxiv",
-                    "source_name": f"ArXiv — {author_str}" if author_str else "ArXiv",
-                    "time_ago": time_ago,
-                    "score": None,
-                })
+                results.append(Topic(
+                    title=title,
+                    url=link,
+                    snippet=summary,
+                    image=None,
+                    source="arxiv",
+                    source_name=f"ArXiv — {author_str}" if author_str else "ArXiv",
+                    time_ago=time_ago,
+                    score=None,
+                ))
             return results
     except Exception as e:
         logger.error(f"ArXiv error: {e}")
@@ -269,7 +308,8 @@ async def fetch_arxiv(limit: int = 10) -> list[dict]:
 # SOURCE 6: TWITTER/X (trending AI posts)
 # ================================================================
 
-async def fetch_twitter(limit: int = 10) -> list[dict]:
+@_single_flight
+async def fetch_twitter(limit: int = 10) -> list[Topic]:
     """Fetch recent popular AI tweets using Twitter API v2 search."""
     if not TWITTER_BEARER:
         return []
@@ -287,44 +327,38 @@ async def fetch_twitter(limit: int = 10) -> list[dict]:
                     "user.fields": "username,name",
                 },
             )
-            data = resp.json()
-            # Build author lookup
-            users = {}
-            for u in data.get("includes", {}).get("users", []):
-                users[u["id"]] = u
+            data = orjson.loads(resp.content)
+            # Build author lookup — only username/name are ever read
+            included = data.get("includes", {}).get("users", [])
+            usernames: dict[str, str] = {u["id"]: u.get("username", "") for u in included}
+            names: dict[str, str] = {u["id"]: u.get("name", "") for u in included}
             results = []
+            now_utc = datetime.now(timezone.utc)
             for tweet in data.get("data", []):
                 metrics = tweet.get("public_metrics", {})
                 likes = metrics.get("like_count", 0)
                 retweets = metrics.get("retweet_count", 0)
-                if likes + retweets < 10:
+                if likes + retweets < TWITTER_MIN_ENGAGEMENT:
                     continue  # Skip low-engagement tweets
-                author = users.get(tweet.get("author_id"), {})
-                username = author.get("username", "")
-                name = author.get("name", "")
+                author_id = tweet.get("author_id")
+                username = usernames.get(author_id, "")
+                name = names.get(author_id, "")
                 created = tweet.get("created_at", "")
                 try:
-                    dt = datetime.fromisoformat(created.replace("Z", "+00:00"))
-                    delta = datetime.now(dt.tzinfo) - dt
-                    if delta.days > 0:
-                        time_ago = f"{delta.days}d ago"
-                    elif delta.seconds > 3600:
-                        time_ago = f"{delta.seconds // 3600}h ago"
-                    else:
-                        time_ago = f"{delta.seconds // 60}m ago"
+                    time_ago = _ago((now_utc - datetime.fromisoformat(created)).total_seconds())
                 except Exception:
                     time_ago = "Recent"
                 text = tweet.get("text", "")
-                results.append({
-                    "title": text[:120] + ("..." if len(text) > 120 else ""),
-                    "url": f"https://x.com/{username}/status/{tweet['id']}" if username else "",
-                    "snippet": text[:200],
-                    "image": None,
-                    "source": "twitter",
-                    "source_name": f"@{username}" if username else "Twitter/X",
-                    "time_ago": time_ago,
-                    "score": likes + retweets,
-                })
+                results.append(Topic(
+                    title=text if len(text) <= 120 else text[:120] + "...",
+                    url=f"https://x.com/{username}/status/{tweet['id']}" if username else "",
+                    snippet=_clip(text, 200),
+                    image=None,
+                    source="twitter",
+                    source_name=f"@{username}" if username else "Twitter/X",
+                    time_ago=time_ago,
+                    score=likes + retweets,
+                ))
             return results
     except Exception as e:
         logger.error(f"Twitter error: {e}")
@@ -335,7 +369,8 @@ async def fetch_twitter(limit: int = 10) -> list[dict]:
 # SOURCE 7: RSS FEEDS (Anthropic, Google AI, TechCrunch, etc.)
 # ================================================================
 
-async def fetch_rss_feed(feed: dict, limit: int = 5) -> list[dict]:
+@async_ttl_cache(maxsize=64, ttl=0, key=lambda feed, limit=5: (feed["url"], limit))
+async def fetch_rss_feed(feed: dict, limit: int = 5) -> list[Topic]:
     """Fetch items from a single RSS/Atom feed."""
     try:
         async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
@@ -366,9 +401,7 @@ async def fetch_rss_feed(feed: dict, limit: int = 5) -> list[dict]:
                     item.findtext("{http://www.w3.org/2005/Atom}summary", "") or
                     ""
                 )
-                # Strip HTML tags from description
-                import re
-                desc = re.sub(r"<[^>]+>", "", desc).strip()[:200]
+                desc = _clip(_strip_html(desc), 200)
                 # Try to get image from media/enclosure
                 image = None
                 enclosure = item.find("enclosure")
@@ -395,23 +428,44 @@ async def fetch_rss_feed(feed: dict, limit: int = 5) -> list[dict]:
                     except Exception:
                         time_ago = "Recent"
                 if title:
-                    results.append({
-                        "title": title,
-                        "url": link,
-                        "snippet": desc,
-                        "image": image,
-                        "source": "rss",
-                        "source_name": feed["name"],
-                        "time_ago": time_ago,
-                        "score": None,
-                    })
+                    results.append(Topic(
+                        title=title,
+                        url=link,
+                        snippet=desc,
+                        image=image,
+                        source="rss",
+                        source_name=feed["name"],
+                        time_ago=time_ago,
+                        score=None,
+                    ))
             return results
     except Exception as e:
         logger.error(f"RSS error for {feed['name']}: {e}")
         return []
 
 
-async def fetch_all_rss() -> list[dict]:
+_HTML_BLOCK_RE = re.compile(r"<(script|style)\b.*?</\1\s*>", re.I | re.S)
+_HTML_TAG_RE = re.compile(r"<!\[CDATA\[|\]\]>|</?[A-Za-z!][^>]*>")
+_WS_RE = re.compile(r"\s+")
+
+
+def _strip_html(markup: str) -> str:
+    """Reduce an RSS description to plain text: drop script/style bodies and
+    tags, decode entities (feeds often double-escape them), collapse spaces."""
+    if "<" not in markup and "&" not in markup:
+        return markup.strip()
+    text, blocks = _HTML_BLOCK_RE.subn(" ", markup)
+    text, tags = _HTML_TAG_RE.subn(" ", text)
+    text = html.unescape(text)
+    if not blocks and not tags and "<" in text:
+        # No real tags: the feed entity-encoded its HTML (&lt;p&gt;), so the
+        # tags only appear once decoded, and their entities are escaped twice.
+        # Escaped prose that already sat between real tags is left alone.
+        text = html.unescape(_HTML_TAG_RE.sub(" ", _HTML_BLOCK_RE.sub(" ", text)))
+    return _WS_RE.sub(" ", text).strip()
+
+
+async def fetch_all_rss() -> list[Topic]:
     """Fetch from all RSS feeds concurrently."""
     tasks = [fetch_rss_feed(feed, limit=5) for feed in RSS_FEEDS]
     raw = await asyncio.gather(*tasks, return_exceptions=True)
@@ -426,11 +480,21 @@ async def fetch_all_rss() -> list[dict]:
 # CATEGORIZER
 # ================================================================
 
-def categorize_topic(topic: dict, query_category: Optional[str] = None) -> str:
+# Row for items no keyword matched, by source (anything else is "breaking").
+_SOURCE_DEFAULT_CAT = {
+    "producthunt": "tools",
+    "arxiv": "research",
+    "reddit": "community",
+    "hackernews": "community",
+    "twitter": "community",
+}
+
+
+def categorize_topic(topic: Topic, query_category: Optional[str] = None) -> str:
     if query_category:
         return query_category
-    title = (topic.get("title") or "").lower()
-    snippet = (topic.get("snippet") or "").lower()
+    title = (topic.title or "").lower()
+    snippet = (topic.snippet or "").lower()
     text = title + " " + snippet
     if any(w in text for w in ["launch", "release", "tool", "app", "product", "api", "open source", "github"]):
         return "tools"
@@ -438,13 +502,7 @@ def categorize_topic(topic: dict, query_category: Optional[str] = None) -> str:
         return "research"
     if any(w in text for w in ["funding", "raise", "startup", "series", "valuation", "yc", "vc", "acquisition"]):
         return "startups"
-    if topic.get("source") in ("reddit", "hackernews", "twitter"):
-        return "community"
-    if topic.get("source") == "producthunt":
-        return "tools"
-    if topic.get("source") == "arxiv":
-        return "research"
-    return "breaking"
+    return _SOURCE_DEFAULT_CAT.get(topic.source, "breaking")
 
 
 # ================================================================
@@ -486,27 +544,28 @@ async def fetch_all_trending(page: int = 0, per_page: int = 50) -> dict:
     seen_titles = set()
 
     for i, result in enumerate(raw_results):
-        if isinstance(result, Exception):
+        if isinstance(result, BaseException):
             logger.error(f"Source error: {result}")
             continue
         source_type, forced_cat, _ = tasks[i]
         for topic in result:
             # Deduplicate by title
-            title_key = topic["title"].lower().strip()[:60]
+            title_key = topic.title.lower().strip()[:60]
             if title_key in seen_titles:
                 continue
             seen_titles.add(title_key)
-            topic["category"] = categorize_topic(topic, forced_cat)
-            if not topic.get("why_trending"):
-                topic["why_trending"] = topic.get("snippet") or f"Trending on {topic.get('source_name', topic.get('source', 'the web'))}"
+            topic.category = categorize_topic(topic, forced_cat)
+            if not topic.why_trending:
+                topic.why_trending = topic.snippet or f"Trending on {topic.source_name or topic.source or 'the web'}"
             all_topics.append(topic)
 
     # Sort by score (highest first), then non-scored items
-    all_topics.sort(key=lambda t: (t.get("score") or 0), reverse=True)
+    all_topics.sort(key=lambda t: (t.score or 0), reverse=True)
 
     start = page * per_page
     end = start + per_page
-    paginated = all_topics[start:end]
+    # Only the returned page is converted to dicts for the JSON response
+    paginated = [asdict(t) for t in all_topics[start:end]]
 
     return {
         "topics": paginated,
@@ -8,18 +8,29 @@ are actual tweet URLs → return as video-ready feed items for yt-dlp download.
 """
 import os
 import re
+import time
+import heapq
 import asyncio
 import logging
-import uuid
+import secrets
+from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
+import orjson
+
+from tools._async_cache import async_ttl_cache
 
 logger = logging.getLogger("twitter_video_scanner")
 
 SERPER_API_KEY = os.getenv("SERPER_API_KEY", "")
 
+# Max Serper requests in flight at once — keeps bursts under the rate budget
+# instead of firing every query and eating 429 retries.
+TWITTER_CONCURRENCY = int(os.getenv("TWITTER_CONCURRENCY", "8"))
+_RATE_SEM = asyncio.Semaphore(TWITTER_CONCURRENCY)
+
 # ─── ACCOUNTS TO TRACK ────────────────────────────────────────────
 TRACKED_ACCOUNTS = {
     "official": [
@@ -39,20 +50,153 @@ TRACKED_ACCOUNTS = {
     ],
 }
 
-# Build search queries — group accounts by tier for focused searches
-SEARCH_QUERIES = [
-    # Official company announcements with video
-    "site:x.com (AnthropicAI OR OpenAI OR GoogleAI OR GoogleDeepMind) video",
-    "site:x.com (MetaAI OR nvidia OR MistralAI OR HuggingFace) video",
-    "site:x.com (StabilityAI OR RunwayML OR perplexity_ai OR Apple) AI video",
-    # Creator posts with demos/videos
-    "site:x.com (DrJimFan OR karpathy OR mattshumer_ OR swyx) AI demo video",
+# Flattened handle -> tier lookup, built once. Earlier tiers win if a handle
+# is listed twice, matching the official > creators > news check order.
+_TIER_NAMES = {"official": "official", "creators": "creator", "news": "news"}
+_HANDLE_TO_TIER: dict[str, str] = {}
+for _tier, _handles in TRACKED_ACCOUNTS.items():
+    for _handle in _handles:
+        _HANDLE_TO_TIER.setdefault(_handle.lower(), _TIER_NAMES[_tier])
+
+_COMPANY_KEYWORDS = frozenset(("ai", "lab", "tech", "deep", "meta", "google", "open", "nvidia"))
+
+# ─── PRECOMPILED PATTERNS ─────────────────────────────────────────
+_TWEET_URL_RE = re.compile(r'https?://(?:x\.com|twitter\.com)/(\w+)/status/(\d+)')
+_URL_RE = re.compile(r'https?://\S+')
+_ON_X_RE = re.compile(r'^[\w\s]+ on X:\s*["\u201c]?')
+_AT_PREFIX_RE = re.compile(r'^[\w\s]+ \(@\w+\):\s*')
+# Trailing " on X" / " / Twitter" / " - X" / " (@handle)" decorations that
+# Google appends to tweet titles (possibly stacked)
+_TITLE_SUFFIX_RE = re.compile(r'(?:\s+(?:on|/|-)\s+(?:X|Twitter)|\s*\(@\w+\))+$')
+# Words in a result's title/snippet that suggest the tweet carries video
+_VIDEO_SIGNAL_RE = re.compile(
+    r"\b(?:video|watch|demo|launch|introducing|announcing|new|released|shipped|built"
+    r"|check out|here's|thread|clip|preview|reveal|showcase)\b",
+    re.I,
+)
+
+# ─── SEARCH QUERIES ───────────────────────────────────────────────
+# Generated from TRACKED_ACCOUNTS so adding a handle updates the searches.
+# Official batches keep an "AI" qualifier: some tracked companies (Apple,
+# nvidia) post plenty of non-AI product video.
+_QUERY_SUFFIX = {"official": "AI video", "creators": "AI demo video"}
+_BROAD_QUERIES = [
     # Broader AI video tweets (catches trending posts)
     "site:x.com AI announcement video demo 2025",
     "site:x.com new AI tool launch video demo",
 ]
 
 
+def _build_account_batches(handles: list[str], max_per_batch: int = 12) -> list[list[str]]:
+    """Split handles into OR-groups of at most max_per_batch."""
+    return [handles[i:i + max_per_batch] for i in range(0, len(handles), max_per_batch)]
+
+
+def _build_search_queries(max_query_len: int = 256) -> list[str]:
+    """One site:x.com query per batch of official/creator handles, plus the
+    broad discovery queries."""
+    queries = []
+    for tier, suffix in _QUERY_SUFFIX.items():
+        for batch in _build_account_batches(TRACKED_ACCOUNTS[tier], max_per_batch=4):
+            query = f"site:x.com ({' OR '.join(batch)}) {suffix}"
+            if len(query) <= max_query_len:
+                queries.append(query)
+    return queries + _BROAD_QUERIES
+
+
+SEARCH_QUERIES = _build_search_queries()
+
+
+@dataclass(slots=True, kw_only=True)
+class VideoTweet:
+    """One video-ready feed item. Kept as a slotted object through search,
+    dedup and ranking; only the returned top-K are turned into dicts (see
+    _enrich). `title` holds the raw Serper title until then."""
+    tweet_id: str
+    title: str
+    full_text: str
+    url: str
+    video_url: str = ""  # Will be resolved by yt-dlp on download
+    video_thumbnail: str
+    video_duration: int = 0
+    video_duration_str: str = ""
+    author: str = ""  # Display name, filled in by _enrich
+    username: str
+    avatar: str = ""
+    verified: bool
+    tier: str
+    likes: int = 0
+    retweets: int = 0
+    views: int = 0
+    engagement: int = 0
+    views_str: str = ""
+    likes_str: str = ""
+    retweets_str: str = ""
+    time_ago: str
+    rank_score: int
+    has_video_signal: bool
+    source: str = "twitter_video"
+    source_name: str
+    category: str = "video_ready"
+
+
+# ─── SHARED HTTP CLIENT ───────────────────────────────────────────
+# One pooled client for every Serper call so parallel queries reuse
+# keep-alive connections (and multiplex over HTTP/2) instead of paying a
+# TCP + TLS handshake per query.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=15,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            http2=True,
+        )
+    return _client
+
+
+async def _post_serper(url: str, payload: dict) -> httpx.Response:
+    """POST to Serper through the shared client, at most TWITTER_CONCURRENCY
+    at a time. On 429, wait for the advertised reset (capped at 30s) and
+    retry once."""
+    headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
+    async with _RATE_SEM:
+        resp = await _get_client().post(url, headers=headers, json=payload)
+        if resp.status_code == 429:
+            delay = _retry_delay(resp)
+            logger.warning("Serper rate limited — retrying in %.1fs", delay)
+            await asyncio.sleep(delay)
+            resp = await _get_client().post(url, headers=headers, json=payload)
+    resp.raise_for_status()
+    return resp
+
+
+def _retry_delay(resp: httpx.Response, default: float = 2.0) -> float:
+    """Seconds to wait after a 429, from x-rate-limit-reset (epoch) or
+    Retry-After (seconds), capped at 30."""
+    reset = resp.headers.get("x-rate-limit-reset")
+    retry_after = resp.headers.get("retry-after")
+    try:
+        if reset:
+            return min(max(float(reset) - time.time(), 0.0), 30.0)
+        if retry_after:
+            return min(float(retry_after), 30.0)
+    except ValueError:
+        pass
+    return default
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  SERPER-POWERED TWITTER VIDEO SEARCH
 # ═══════════════════════════════════════════════════════════════════
@@ -65,41 +209,65 @@ async def fetch_video_tweets(max_results: int = 20, hours_back: int = 72) -> lis
         logger.warning("SERPER_API_KEY not set — cannot scan Twitter videos")
         return []
 
-    # Run all search queries in parallel
-    tasks = [_search_serper_twitter(q, num=8) for q in SEARCH_QUERIES]
-    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Run all search queries in parallel, merging results as each query
+    # lands; once there is enough headroom for ranking, cancel the rest
+    tasks = [asyncio.create_task(_search_serper_twitter(q, num=8)) for q in SEARCH_QUERIES]
+    target = max_results * 3
 
-    all_results = []
-    for result in batch_results:
-        if isinstance(result, list):
-            all_results.extend(result)
-
-    # Deduplicate by tweet URL
-    seen_urls = set()
-    unique = []
-    for item in all_results:
-        url_key = item.get("url", "").split("?")[0].lower()
-        if url_key and url_key not in seen_urls:
-            seen_urls.add(url_key)
-            unique.append(item)
-
-    # Sort by position score (Serper rank) — higher ranked = more relevant
-    unique.sort(key=lambda x: x.get("rank_score", 0), reverse=True)
-
-    return unique[:max_results]
-
-
-async def _search_serper_twitter(query: str, num: int = 8) -> list[dict]:
+    # Deduplicate by numeric tweet ID (also catches x.com vs twitter.com
+    # links to the same tweet); fall back to the URL path otherwise. One
+    # dict does both the membership test and the ordered store, and keeps
+    # the best-ranked copy when several queries return the same tweet.
+    unique: dict = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                batch = await next_done
+            except Exception as e:
+                logger.error("Serper Twitter query failed: %s", e)
+                continue
+            for item in batch:
+                tweet_id = item.tweet_id
+                key = int(tweet_id) if tweet_id.isdigit() else item.url.split("?", 1)[0].lower()
+                if not key:
+                    continue
+                kept = unique.get(key)
+                if kept is None or item.rank_score > kept.rank_score:
+                    unique[key] = item
+            if len(unique) >= target:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Top-K by position score (Serper rank) — higher ranked = more relevant
+    top = heapq.nlargest(max_results, unique.values(), key=lambda x: x.rank_score)
+    return [_enrich(t) for t in top]
+
+
+def _enrich(tweet: VideoTweet) -> dict:
+    """Turn a ranked VideoTweet into the feed dict, doing the display-only
+    formatting (title cleanup, author name) that dropped candidates never
+    need. Cached VideoTweets are shared, so the dict is edited, not them."""
+    item = asdict(tweet)
+    # Clean title — remove "on X" / "on Twitter" suffixes
+    item["title"] = _clean_serper_title(tweet.title, tweet.full_text, tweet.username)
+    item["author"] = _format_display_name(tweet.username)
+    return item
+
+
+# Identical queries within 5 minutes are served from memory (feed refreshes
+# re-run the same SEARCH_QUERIES); concurrent misses share one request.
+@async_ttl_cache(maxsize=128, ttl=300)
+async def _search_serper_twitter(query: str, num: int = 8) -> list[VideoTweet]:
     """Search Serper for Twitter/X posts matching query."""
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.post(
-                "https://google.serper.dev/search",
-                headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": query, "num": num, "tbs": "qdr:w"},  # Last week
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await _post_serper(
+            "https://google.serper.dev/search",
+            {"q": query, "num": num, "tbs": "qdr:w"},  # Last week
+        )
+        data = orjson.loads(resp.content)
 
         results = []
         organic = data.get("organic", [])
@@ -108,25 +276,18 @@ async def _search_serper_twitter(query: str, num: int = 8) -> list[dict]:
             link = item.get("link", "")
 
             # Only keep actual tweet URLs (not profile pages, lists, etc.)
-            if not _is_tweet_url(link):
-                continue
-
-            # Extract username and tweet ID from URL
-            username, tweet_id = _parse_tweet_url(link)
-            if not username:
+            # and pull username + tweet ID out of the same match
+            parsed = _match_tweet_url(link)
+            if not parsed:
                 continue
+            username, tweet_id = parsed
 
             title = item.get("title", "")
             snippet = item.get("snippet", "")
 
             # Check if this looks like it has video content
             # (Serper snippets often mention "video" or the title indicates media)
-            text_lower = (title + " " + snippet).lower()
-            has_video_signal = any(w in text_lower for w in [
-                "video", "watch", "demo", "launch", "introducing", "announcing",
-                "new", "released", "shipped", "built", "check out", "here's",
-                "thread", "clip", "preview", "reveal", "showcase",
-            ])
+            has_video_signal = bool(_VIDEO_SIGNAL_RE.search(title + " " + snippet))
 
             # Get thumbnail if available
             thumbnail = ""
@@ -138,9 +299,6 @@ async def _search_serper_twitter(query: str, num: int = 8) -> list[dict]:
             # Determine tier
             tier = _get_account_tier(username)
 
-            # Clean title — remove "on X" / "on Twitter" suffixes
-            clean_title = _clean_serper_title(title, snippet, username)
-
             # Rank score: position in results + video signal bonus + tier bonus
             rank_score = (num - i) * 10  # Higher rank = more points
             if has_video_signal:
@@ -150,100 +308,71 @@ async def _search_serper_twitter(query: str, num: int = 8) -> list[dict]:
             elif tier == "creator":
                 rank_score += 15
 
-            results.append({
-                "tweet_id": tweet_id or str(uuid.uuid4())[:12],
-                "title": clean_title,
-                "full_text": snippet,
-                "url": link,
-                "video_url": "",  # Will be resolved by yt-dlp on download
-                "video_thumbnail": thumbnail,
-                "video_duration": 0,
-                "video_duration_str": "",
-                "author": _format_display_name(username),
-                "username": username,
-                "avatar": "",
-                "verified": tier == "official",
-                "tier": tier,
-                "likes": 0,
-                "retweets": 0,
-                "views": 0,
-                "engagement": 0,
-                "views_str": "",
-                "likes_str": "",
-                "retweets_str": "",
-                "time_ago": item.get("date", "Recent"),
-                "rank_score": rank_score,
-                "has_video_signal": has_video_signal,
-                "source": "twitter_video",
-                "source_name": f"@{username}",
-                "category": "video_ready",
-            })
+            results.append(VideoTweet(
+                tweet_id=tweet_id or secrets.token_hex(6),
+                title=title,
+                full_text=snippet,
+                url=link,
+                video_thumbnail=thumbnail,
+                username=username,
+                verified=tier == "official",
+                tier=tier,
+                time_ago=item.get("date", "Recent"),
+                rank_score=rank_score,
+                has_video_signal=has_video_signal,
+                source_name=f"@{username}",
+            ))
 
         return results
 
-    except Exception as e:
-        logger.error("Serper Twitter search error: %s", e)
+    except (httpx.HTTPError, ValueError, KeyError):
+        # Narrow on purpose: cancellation from fetch_video_tweets' early exit
+        # must propagate, and bugs should surface rather than read as "no results"
+        logger.exception("Serper Twitter search error")
         return []
 
 
 # Also search Serper Videos endpoint for Twitter video content
-async def _search_serper_twitter_videos(query: str, num: int = 5) -> list[dict]:
+@async_ttl_cache(maxsize=128, ttl=300)
+async def _search_serper_twitter_videos(query: str, num: int = 5) -> list[VideoTweet]:
     """Search Serper Videos endpoint for Twitter/X video content."""
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.post(
-                "https://google.serper.dev/videos",
-                headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": query, "num": num},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await _post_serper(
+            "https://google.serper.dev/videos",
+            {"q": query, "num": num},
+        )
+        data = orjson.loads(resp.content)
 
         results = []
         for i, v in enumerate(data.get("videos", [])):
             link = v.get("link", "")
-            if not _is_tweet_url(link):
-                continue
-
-            username, tweet_id = _parse_tweet_url(link)
-            if not username:
+            parsed = _match_tweet_url(link)
+            if not parsed:
                 continue
+            username, tweet_id = parsed
 
             tier = _get_account_tier(username)
             duration = v.get("duration", "")
 
-            results.append({
-                "tweet_id": tweet_id or str(uuid.uuid4())[:12],
-                "title": _clean_serper_title(v.get("title", ""), v.get("snippet", ""), username),
-                "full_text": v.get("snippet", ""),
-                "url": link,
-                "video_url": "",
-                "video_thumbnail": v.get("imageUrl") or v.get("thumbnailUrl", ""),
-                "video_duration": 0,
-                "video_duration_str": duration or "",
-                "author": _format_display_name(username),
-                "username": username,
-                "avatar": "",
-                "verified": tier == "official",
-                "tier": tier,
-                "likes": 0,
-                "retweets": 0,
-                "views": 0,
-                "engagement": 0,
-                "views_str": "",
-                "likes_str": "",
-                "retweets_str": "",
-                "time_ago": v.get("date", "Recent"),
-                "rank_score": (num - i) * 10 + 40,  # Video endpoint gets bonus
-                "has_video_signal": True,
-                "source": "twitter_video",
-                "source_name": f"@{username}",
-                "category": "video_ready",
-            })
+            results.append(VideoTweet(
+                tweet_id=tweet_id or secrets.token_hex(6),
+                title=v.get("title", ""),
+                full_text=v.get("snippet", ""),
+                url=link,
+                video_thumbnail=v.get("imageUrl") or v.get("thumbnailUrl", ""),
+                video_duration_str=duration or "",
+                username=username,
+                verified=tier == "official",
+                tier=tier,
+                time_ago=v.get("date", "Recent"),
+                rank_score=(num - i) * 10 + 40,  # Video endpoint gets bonus
+                has_video_signal=True,
+                source_name=f"@{username}",
+            ))
 
         return results
-    except Exception as e:
-        logger.error("Serper Twitter videos error: %s", e)
+    except (httpx.HTTPError, ValueError, KeyError):
+        logger.exception("Serper Twitter videos error")
         return []
 
 
@@ -251,42 +380,31 @@ async def _search_serper_twitter_videos(query: str, num: int = 5) -> list[dict]:
 #  HELPERS
 # ═══════════════════════════════════════════════════════════════════
 
-def _is_tweet_url(url: str) -> bool:
-    """Check if URL is an actual tweet (not a profile, list, search, etc.)."""
-    patterns = [
-        r'https?://(x\.com|twitter\.com)/\w+/status/\d+',
-    ]
-    return any(re.match(p, url) for p in patterns)
-
-
-def _parse_tweet_url(url: str) -> tuple[str, str]:
-    """Extract username and tweet ID from a tweet URL."""
-    match = re.search(r'(?:x\.com|twitter\.com)/(\w+)/status/(\d+)', url)
-    if match:
-        return match.group(1), match.group(2)
-    return "", ""
+def _match_tweet_url(url: str) -> Optional[tuple[str, str]]:
+    """Return (username, tweet_id) if URL is an actual tweet (not a profile,
+    list, search, etc.), else None — validity check and parse in one pass."""
+    match = _TWEET_URL_RE.match(url)
+    return match.groups() if match else None
 
 
 def _clean_serper_title(title: str, snippet: str, username: str) -> str:
     """Clean Serper search result title into a usable topic title."""
-    # Remove common suffixes
-    for suffix in [" on X", " / X", " / Twitter", " on Twitter",
-                   f" (@{username})", f"({username})", " - X", " - Twitter"]:
-        title = title.replace(suffix, "")
+    # Remove common suffixes in one anchored pass
+    title = _TITLE_SUFFIX_RE.sub('', title).removesuffix(f"({username})").rstrip()
 
     # Remove username prefix patterns
-    title = re.sub(r'^[\w\s]+ on X:\s*["\u201c]?', '', title)
-    title = re.sub(r'^[\w\s]+ \(@\w+\):\s*', '', title)
+    title = _ON_X_RE.sub('', title)
+    title = _AT_PREFIX_RE.sub('', title)
 
     # Remove surrounding quotes
-    title = title.strip('""\u201c\u201d\'')
+    title = title.strip('"\u201c\u201d\'')
 
     # If title is too short after cleaning, use snippet
     if len(title) < 15 and snippet:
         title = snippet.split('.')[0].strip()
 
     # Remove URLs from title
-    title = re.sub(r'https?://\S+', '', title).strip()
+    title = _URL_RE.sub('', title).strip()
 
     # Truncate
     if len(title) > 120:
@@ -298,44 +416,40 @@ def _clean_serper_title(title: str, snippet: str, username: str) -> str:
 def _get_account_tier(username: str) -> str:
     """Determine which tier an account belongs to."""
     lower = username.lower()
-    for handle in TRACKED_ACCOUNTS.get("official", []):
-        if handle.lower() == lower:
-            return "official"
-    for handle in TRACKED_ACCOUNTS.get("creators", []):
-        if handle.lower() == lower:
-            return "creator"
-    for handle in TRACKED_ACCOUNTS.get("news", []):
-        if handle.lower() == lower:
-            return "news"
-    # Default: check if it looks like a company account
-    company_keywords = ["ai", "lab", "tech", "deep", "meta", "google", "open", "nvidia"]
-    if any(kw in lower for kw in company_keywords):
+    return _HANDLE_TO_TIER.get(lower) or _fallback_tier(lower)
+
+
+def _fallback_tier(lower: str) -> str:
+    """Untracked account: treat it as official if it looks like a company."""
+    if any(kw in lower for kw in _COMPANY_KEYWORDS):
         return "official"
     return "creator"
 
 
+_DISPLAY_NAMES = {
+    "anthropicai": "Anthropic", "openai": "OpenAI",
+    "googleai": "Google AI", "googledeepmind": "Google DeepMind",
+    "metaai": "Meta AI", "nvidia": "NVIDIA",
+    "mistralai": "Mistral AI", "huggingface": "Hugging Face",
+    "stabilityai": "Stability AI", "runwayml": "Runway",
+    "perplexity_ai": "Perplexity", "cohereai": "Cohere",
+    "apple": "Apple", "drjimfan": "Jim Fan",
+    "karpathy": "Andrej Karpathy", "yannlecun": "Yann LeCun",
+    "swyx": "swyx", "mattshumer_": "Matt Shumer",
+    "theaigrid": "The AI Grid", "ai_for_success": "AI for Success",
+}
+
+
 def _format_display_name(username: str) -> str:
     """Convert username to a display-friendly name."""
-    known = {
-        "anthropicai": "Anthropic", "openai": "OpenAI",
-        "googleai": "Google AI", "googledeepmind": "Google DeepMind",
-        "metaai": "Meta AI", "nvidia": "NVIDIA",
-        "mistralai": "Mistral AI", "huggingface": "Hugging Face",
-        "stabilityai": "Stability AI", "runwayml": "Runway",
-        "perplexity_ai": "Perplexity", "cohereai": "Cohere",
-        "apple": "Apple", "drjimfan": "Jim Fan",
-        "karpathy": "Andrej Karpathy", "yannlecun": "Yann LeCun",
-        "swyx": "swyx", "mattshumer_": "Matt Shumer",
-        "theaigrid": "The AI Grid", "ai_for_success": "AI for Success",
-    }
-    return known.get(username.lower(), username)
+    return _DISPLAY_NAMES.get(username.lower(), username)
 
 
 def _format_count(count: int) -> str:
+    if count <= 0:
+        return ""  # zero is the common case for Serper-sourced items
     if count >= 1_000_000:
         return f"{count / 1_000_000:.1f}M"
     if count >= 1_000:
         return f"{count / 1_000:.1f}K"
-    if count > 0:
-        return str(count)
-    return ""
+    return str(count)
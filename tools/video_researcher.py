@@ -5,16 +5,30 @@ Upload: Supabase Storage for permanent hosting.
 """
 import os
 import re
-import json
-import uuid
+import heapq
+import bisect
 import asyncio
+import functools
+import time
+import shutil
+import signal
+import secrets
+import string
+import hashlib
+import itertools
 import logging
 import tempfile
+import mimetypes
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-from datetime import datetime
+from urllib.parse import urlsplit
 
 import httpx
+import orjson
+
+from tools._async_cache import async_ttl_cache
 
 logger = logging.getLogger("video_researcher")
 
@@ -24,6 +38,18 @@ PEXELS_API_KEY = os.getenv("PEXELS_API_KEY", "")
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 SUPABASE_BUCKET = os.getenv("SUPABASE_VIDEO_BUCKET", "videos")
+SUPABASE_VIDEO_CACHE_TABLE = os.getenv("SUPABASE_VIDEO_CACHE_TABLE", "hosted_videos")
+HOSTED_VIDEO_TTL_DAYS = 30  # A topic's hosted video is reused for this long
+
+# Search results are reused for an hour, keyed on the normalized query —
+# retries and overlapping topics re-run the same searches; concurrent
+# identical searches share one call.
+SEARCH_CACHE_TTL = 3600
+SEARCH_TASK_TIMEOUT = 12  # Per-strategy deadline inside search_videos
+# YouTube's scrape → yt-dlp fallback chain has to fit inside that deadline
+YOUTUBE_SCRAPE_TIMEOUT = 4
+YTDLP_SEARCH_TIMEOUT = 7  # Includes waiting for a free extractor slot
+SIMHASH_MAX_DISTANCE = 3  # Titles whose 64-bit SimHashes differ by ≤ this many bits are duplicates
 
 MAX_VIDEO_SIZE_MB = 100
 MAX_VIDEO_DURATION = 600  # 10 min cap
@@ -46,6 +72,133 @@ NEWS_CHANNELS_BLOCKLIST = {
     "lex fridman",  # long-form interviews, not B-roll
 }
 
+# ─── B-ROLL SCORING VOCABULARY ───────────────────────────────────
+# Each list is compiled into one regex below, so scoring walks the text once
+# per category instead of running a substring scan per keyword.
+DEMO_WORDS = (
+    "demo", "tutorial", "walkthrough", "how to", "screen recording",
+    "hands on", "hands-on", "first look", "getting started",
+    "overview", "features", "introduction", "intro to",
+    "using", "setup", "guide", "showcase", "preview",
+)
+OFFICIAL_CHANNELS = (
+    "google", "openai", "anthropic", "microsoft", "apple",
+    "nvidia", "meta", "amazon", "hugging face", "stability ai",
+    "midjourney", "runway", "google deepmind", "google ai",
+)
+CREATOR_CHANNELS = (
+    "matt wolfe", "fireship", "two minute papers", "ai explained",
+    "all about ai", "matt vdm", "corbin brown", "riley brown",
+    "web dev simplified", "theo", "coding in flow",
+)
+NEWS_WORDS = (
+    "breaking news", "breaking:", "live:", "exclusive:",
+    "report", "reporting", "anchor", "coverage", "interview",
+    "panel discussion", "press conference", "testimony",
+    "hearing", "committee", "correspondent", "analysis",
+)
+NEWS_CHANNEL_PATTERNS = (
+    "news", "tv", "television", "broadcast", "daily", "times",
+    "post", "journal", "herald", "tribune", "gazette",
+)
+# Channels whose names look news-like but are useful tech sources
+NEWS_PATTERN_EXEMPT = frozenset({"product hunt", "hacker news"})
+# Duration buckets (upper bounds, seconds) → score; one bisect, no if-ladder.
+# Unknown (0) = no change, <1 min = perfect for shorts, 1-3 min = great,
+# 3-5 min = okay, 5-10 min = meh, over 10 min = probably not B-roll.
+_DURATION_BOUNDS = (0, 60, 180, 300, 600)
+_DURATION_SCORES = (0, 250, 200, 100, 0, -200)
+
+
+def _phrase_scanner(phrases):
+    """Compile `phrases` into one overlapping-match regex and return a
+    function giving the set of phrases found in a string — the same answer
+    as `{p for p in phrases if p in text}`, in a single pass over `text`."""
+    ordered = sorted(set(phrases), key=len, reverse=True)
+    regex = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))")
+    # Longest-first alternation reports "reporting" where "report" also
+    # starts, so each hit carries every phrase it contains.
+    within = {p: frozenset(q for q in ordered if q in p) for p in ordered}
+
+    def scan(text: str) -> set:
+        found = set()
+        for m in regex.finditer(text):
+            found |= within[m.group(1)]
+        return found
+    return scan
+
+
+def _any_phrase(phrases) -> re.Pattern:
+    """One alternation for "does any phrase occur" checks."""
+    return re.compile("|".join(map(re.escape, sorted(phrases, key=len, reverse=True))))
+
+
+_scan_demo_words = _phrase_scanner(DEMO_WORDS)
+_scan_news_words = _phrase_scanner(NEWS_WORDS)
+_scan_news_patterns = _phrase_scanner(NEWS_CHANNEL_PATTERNS)
+# Cheap gate: most titles/descriptions contain none of the text keywords,
+# so one combined search decides whether the counting scans run at all
+_TEXT_KEYWORD_RE = _any_phrase(DEMO_WORDS + NEWS_WORDS)
+_OFFICIAL_RE = _any_phrase(OFFICIAL_CHANNELS)
+_CREATOR_RE = _any_phrase(CREATOR_CHANNELS)
+# Blocklisted names as whole words, so "CNN Business" or "Bloomberg
+# Originals" are caught but "ap" does not hit "Apple".
+_NEWS_CHANNEL_RE = re.compile(
+    r"\b(?:" + "|".join(map(re.escape, sorted(NEWS_CHANNELS_BLOCKLIST, key=len, reverse=True))) + r")\b"
+)
+
+# ─── PLATFORM DOMAINS ────────────────────────────────────────────
+_PLATFORM_BY_DOMAIN = {
+    "youtube.com": "YouTube", "youtu.be": "YouTube",
+    "twitter.com": "Twitter/X", "x.com": "Twitter/X",
+    "vimeo.com": "Vimeo",
+    "tiktok.com": "TikTok",
+    "dailymotion.com": "Dailymotion",
+}
+
+# ─── PRECOMPILED PATTERNS ────────────────────────────────────────
+_PUNCT_RE = re.compile(r'[^\w\s]')          # topic → searchable words
+_YT_ID_RE = re.compile(r'(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})')
+_YT_INITIAL_DATA_RE = re.compile(rb'var ytInitialData = (\{.+?\});</script>', re.S)
+_NON_DIGIT_RE = re.compile(r'\D')
+_BROWSER_UA = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+               "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+# str.translate table for storage file names: ASCII letters, digits and
+# "._-" keep themselves, every other code point becomes "_" via __missing__
+# (no million-entry table for non-ASCII).
+class _SafeNameTable(dict):
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+_SAFE_NAME_TABLE = _SafeNameTable(
+    {ord(c): c for c in string.ascii_letters + string.digits + "._-"}
+)
+
+# str.translate table for title tokenizing: word characters (what \w
+# matches) keep themselves, everything else becomes a space. Filled in
+# lazily per code point, so no 0x110000-entry table is built up front.
+class _TokenTable(dict):
+    def __missing__(self, codepoint: int) -> str:
+        ch = chr(codepoint)
+        mapped = self[codepoint] = ch if ch.isalnum() or ch == "_" else " "
+        return mapped
+
+
+_TOKEN_TABLE = _TokenTable()
+
+# Filler words dropped by _extract_core_subject when building search queries
+_FILLER = frozenset({
+    "just", "the", "this", "that", "is", "are", "was", "were", "has", "have",
+    "had", "been", "being", "a", "an", "of", "in", "on", "for", "to", "and",
+    "but", "or", "so", "yet", "with", "from", "by", "at", "it", "its",
+    "might", "could", "would", "should", "will", "can", "may", "do", "does",
+    "did", "not", "all", "very", "really", "here", "there", "now", "new",
+    "out", "about", "how", "what", "when", "where", "who", "why",
+    "every", "some", "any", "no", "only", "own", "your", "our", "my",
+})
+
 # ─── SEARCH QUERY TEMPLATES ──────────────────────────────────────
 # Multiple search strategies to find usable content, not news coverage
 DEMO_SUFFIXES = [
@@ -55,10 +208,78 @@ DEMO_SUFFIXES = [
     "official announcement",
 ]
 
+# ─── RESULT IDS ──────────────────────────────────────────────────
+# Result IDs only key the picker cards in the UI, so they just have to be
+# unique: a random per-process prefix plus a counter, no urandom per result.
+_RESULT_ID_PREFIX = secrets.token_hex(3)
+_result_ids = itertools.count()
+
+
+def _result_id() -> str:
+    return f"{_RESULT_ID_PREFIX}{next(_result_ids):x}"
+
+
+# ─── SHARED HTTP CLIENT ───────────────────────────────────────────
+# One pooled client for Pexels, Serper and Supabase so repeat calls reuse
+# keep-alive connections instead of paying a TCP + TLS handshake each time.
+# Slow transfers (upload / direct download) pass their own timeout.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=15,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            http2=True,
+        )
+    return _client
+
+
+# ─── yt-dlp WORKER POOL ───────────────────────────────────────────
+# YouTube searches run yt-dlp's Python API in-process on a small persistent
+# thread pool (the work is network-bound), each thread reusing one
+# YoutubeDL instance — no CLI process or interpreter start-up per search.
+# Created on first use.
+YTDLP_WORKERS = int(os.getenv("YTDLP_WORKERS", "4"))
+_YTDLP_SEM = asyncio.Semaphore(YTDLP_WORKERS)
+_pool: Optional[ThreadPoolExecutor] = None
+_ydl_local = threading.local()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=YTDLP_WORKERS, thread_name_prefix="ytdlp")
+    return _pool
+
+
+async def aclose() -> None:
+    """Close the shared HTTP client and yt-dlp workers (called on app shutdown)."""
+    global _client, _pool
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _search_cache_key(query: str, max_results: Optional[int] = None) -> tuple:
+    """Case- and whitespace-insensitive cache key for the search functions."""
+    return " ".join(query.lower().split()), max_results
+
+
+def _copy_results(videos: list[dict]) -> list[dict]:
+    """Per-caller copies of cached search results (values are all scalars)."""
+    return [dict(v) for v in videos]
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  0. PEXELS VIDEO SEARCH (primary downloadable source)
 # ═══════════════════════════════════════════════════════════════════
+@async_ttl_cache(maxsize=256, ttl=SEARCH_CACHE_TTL, key=_search_cache_key, copy=_copy_results)
 async def search_pexels_videos(query: str, max_results: int = 6) -> list[dict]:
     """Search Pexels for royalty-free stock B-roll videos.
     Pexels videos have direct download URLs — no yt-dlp or PO tokens needed."""
@@ -66,28 +287,24 @@ async def search_pexels_videos(query: str, max_results: int = 6) -> list[dict]:
         logger.warning("PEXELS_API_KEY not set — skipping Pexels video search")
         return []
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(
-                "https://api.pexels.com/videos/search",
-                headers={"Authorization": PEXELS_API_KEY},
-                params={"query": query, "per_page": max_results, "orientation": "landscape"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await _get_client().get(
+            "https://api.pexels.com/videos/search",
+            headers={"Authorization": PEXELS_API_KEY},
+            params={"query": query, "per_page": max_results, "orientation": "landscape"},
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
 
         results = []
         for v in data.get("videos", []):
-            # Pick best video file ≤1080p
-            files = sorted(v.get("video_files", []), key=lambda f: f.get("width", 0), reverse=True)
-            best = next((f for f in files if f.get("width", 0) <= 1920 and f.get("file_type") == "video/mp4"), None)
-            if not best:
-                best = next((f for f in files if f.get("file_type") == "video/mp4"), None)
+            best = _pick_pexels_file(v.get("video_files", []))
             if not best:
                 continue
             duration = v.get("duration", 0)
             user = v.get("user", {})
+            channel = f"{user.get('name', 'Pexels')} (Pexels)"
             results.append({
-                "id": str(uuid.uuid4())[:8],
+                "id": _result_id(),
                 "source": "pexels",
                 "platform": "Pexels",
                 "video_id": str(v.get("id", "")),
@@ -97,7 +314,8 @@ async def search_pexels_videos(query: str, max_results: int = 6) -> list[dict]:
                 "thumbnail": v.get("image", ""),
                 "duration": duration,
                 "duration_str": f"{duration//60}:{duration%60:02d}" if duration else "?",
-                "channel": f"{user.get('name', 'Pexels')} (Pexels)",
+                "channel": channel,
+                "channel_lc": channel.strip().lower(),  # normalized once for filtering/scoring
                 "views": 0,
                 "views_str": "Royalty-free",
                 "upload_date": "",
@@ -113,49 +331,48 @@ async def search_pexels_videos(query: str, max_results: int = 6) -> list[dict]:
 # ═══════════════════════════════════════════════════════════════════
 #  1. YOUTUBE SEARCH VIA yt-dlp
 # ═══════════════════════════════════════════════════════════════════
+@async_ttl_cache(maxsize=256, ttl=SEARCH_CACHE_TTL, key=_search_cache_key, copy=_copy_results)
 async def search_youtube(query: str, max_results: int = 5) -> list[dict]:
-    """Search YouTube via yt-dlp and return metadata for top results."""
-    search_url = f"ytsearch{max_results}:{query}"
-    cmd = [
-        "yt-dlp", "--dump-json", "--no-download", "--flat-playlist",
-        "--no-warnings", "--quiet", search_url
-    ]
+    """Search YouTube and return metadata for top results. Reads the results
+    page directly; falls back to yt-dlp if the page can't be parsed."""
     try:
-        proc = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=30)
+        entries = await _scrape_youtube_search(query, max_results)
+        if not entries:
+            # yt-dlp's Python API on a pool thread — no subprocess per
+            # search, and the semaphore caps concurrent extractors
+            async with asyncio.timeout(YTDLP_SEARCH_TIMEOUT), _YTDLP_SEM:
+                entries = await asyncio.get_running_loop().run_in_executor(
+                    _get_pool(), _ydl_search, query, max_results)
         results = []
-        for line in stdout.decode().strip().split("\n"):
-            if not line.strip():
-                continue
+        for data in entries:
             try:
-                data = json.loads(line)
-                duration = data.get("duration") or 0
+                duration = int(data.get("duration") or 0)  # flat yt-dlp entries give float seconds
+                views = data.get("view_count") or 0
                 channel = data.get("channel") or data.get("uploader") or "Unknown"
                 results.append({
-                    "id": str(uuid.uuid4())[:8],
+                    "id": _result_id(),
                     "source": "youtube",
                     "platform": "YouTube",
                     "video_id": data.get("id", ""),
                     "title": data.get("title", "Untitled"),
                     "url": data.get("url") or f"https://www.youtube.com/watch?v={data.get('id', '')}",
-                    "thumbnail": data.get("thumbnail") or data.get("thumbnails", [{}])[-1].get("url", ""),
+                    "thumbnail": data.get("thumbnail") or _last_thumbnail(data.get("thumbnails")),
                     "duration": duration,
-                    "duration_str": f"{int(duration)//60}:{int(duration)%60:02d}" if duration else "?",
+                    "duration_str": f"{duration//60}:{duration%60:02d}" if duration else "?",
                     "channel": channel,
-                    "views": data.get("view_count") or 0,
-                    "views_str": _format_views(data.get("view_count") or 0),
+                    "channel_lc": channel.strip().lower(),
+                    "views": views,
+                    "views_str": _format_views(views),
                     "upload_date": data.get("upload_date", ""),
                     "description": (data.get("description") or "")[:200],
                 })
-            except (json.JSONDecodeError, KeyError):
+            except KeyError:
                 continue
         return results
     except asyncio.TimeoutError:
         logger.warning("YouTube search timed out for: %s", query)
         return []
-    except FileNotFoundError:
+    except ImportError:
         logger.error("yt-dlp not found. Install with: pip install yt-dlp")
         return []
     except Exception as e:
@@ -163,31 +380,111 @@ async def search_youtube(query: str, max_results: int = 5) -> list[dict]:
         return []
 
 
+async def _scrape_youtube_search(query: str, max_results: int) -> list[dict]:
+    """Read search results from the ytInitialData JSON embedded in YouTube's
+    results page — one HTTP request, no extractor start-up. Returns entries
+    shaped like yt-dlp's flat output, or [] if the page can't be parsed."""
+    try:
+        resp = await _get_client().get(
+            "https://www.youtube.com/results",
+            params={"search_query": query},
+            headers={"User-Agent": _BROWSER_UA, "Accept-Language": "en-US,en;q=0.9"},
+            follow_redirects=True,
+            timeout=YOUTUBE_SCRAPE_TIMEOUT,
+        )
+        resp.raise_for_status()
+        match = _YT_INITIAL_DATA_RE.search(resp.content)
+        if not match:
+            return []
+        data = orjson.loads(match.group(1))
+        sections = (data["contents"]["twoColumnSearchResultsRenderer"]
+                    ["primaryContents"]["sectionListRenderer"]["contents"])
+    except (httpx.HTTPError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+        logger.info("YouTube page scrape failed, using yt-dlp: %s", e)
+        return []
+
+    entries = []
+    for section in sections:
+        for item in section.get("itemSectionRenderer", {}).get("contents", []):
+            video = item.get("videoRenderer")
+            if not video or not video.get("videoId"):
+                continue
+            video_id = video["videoId"]
+            snippets = video.get("detailedMetadataSnippets") or [{}]
+            entries.append({
+                "id": video_id,
+                "title": _yt_text(video.get("title")) or "Untitled",
+                "url": f"https://www.youtube.com/watch?v={video_id}",
+                "thumbnail": _last_thumbnail(video.get("thumbnail", {}).get("thumbnails")),
+                "duration": _parse_duration(_yt_text(video.get("lengthText"))),
+                "channel": _yt_text(video.get("ownerText")),
+                "view_count": int(_NON_DIGIT_RE.sub("", _yt_text(video.get("viewCountText"))) or 0),
+                "description": _yt_text(snippets[0].get("snippetText")),
+            })
+            if len(entries) >= max_results:
+                return entries
+    return entries
+
+
+def _last_thumbnail(thumbs: Optional[list]) -> str:
+    """URL of the last (largest) entry in a thumbnails list, or ""."""
+    return thumbs[-1].get("url", "") if thumbs else ""
+
+
+def _yt_text(node: Optional[dict]) -> str:
+    """Flatten a YouTube text node ({"simpleText": ...} or {"runs": [...]})."""
+    if not node:
+        return ""
+    if "simpleText" in node:
+        return node["simpleText"]
+    return "".join(run.get("text", "") for run in node.get("runs", []))
+
+
+def _ydl_search(query: str, max_results: int) -> list[dict]:
+    """Runs on a pool thread. Same flat metadata as
+    `yt-dlp --dump-json --flat-playlist ytsearchN:query`. Each thread keeps
+    its own YoutubeDL (instances aren't shared across threads), so extractor
+    setup is paid once per thread."""
+    ydl = getattr(_ydl_local, "ydl", None)
+    if ydl is None:
+        from yt_dlp import YoutubeDL
+
+        ydl = _ydl_local.ydl = YoutubeDL(
+            {"quiet": True, "no_warnings": True, "skip_download": True, "extract_flat": True}
+        )
+    info = ydl.extract_info(f"ytsearch{max_results}:{query}", download=False)
+    return list(info.get("entries") or [])
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  2. SERPER VIDEO SEARCH (Google Videos)
 # ═══════════════════════════════════════════════════════════════════
+@async_ttl_cache(maxsize=256, ttl=SEARCH_CACHE_TTL, key=_search_cache_key, copy=_copy_results)
 async def search_serper_videos(query: str, max_results: int = 5) -> list[dict]:
     """Search for videos via Serper API (Google Videos endpoint)."""
     if not SERPER_API_KEY:
         logger.warning("SERPER_API_KEY not set — skipping Serper video search")
         return []
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.post(
-                "https://google.serper.dev/videos",
-                headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
-                json={"q": query, "num": max_results}
-            )
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await _get_client().post(
+            "https://google.serper.dev/videos",
+            headers={"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"},
+            json={"q": query, "num": max_results}
+        )
+        resp.raise_for_status()
+        try:
+            data = orjson.loads(resp.content)
+        except orjson.JSONDecodeError:
+            data = resp.json()  # stdlib is laxer (NaN/Infinity)
 
         results = []
         for v in data.get("videos", [])[:max_results]:
             link = v.get("link", "")
             platform = _detect_platform(link)
             duration = _parse_duration(v.get("duration", ""))
+            channel = v.get("channel") or v.get("source", "Unknown")
             results.append({
-                "id": str(uuid.uuid4())[:8],
+                "id": _result_id(),
                 "source": "serper",
                 "platform": platform,
                 "video_id": _extract_video_id(link),
@@ -196,7 +493,8 @@ async def search_serper_videos(query: str, max_results: int = 5) -> list[dict]:
                 "thumbnail": v.get("imageUrl") or v.get("thumbnailUrl", ""),
                 "duration": duration,
                 "duration_str": v.get("duration", "?"),
-                "channel": v.get("channel") or v.get("source", "Unknown"),
+                "channel": channel,
+                "channel_lc": channel.strip().lower(),
                 "views": 0,
                 "views_str": "",
                 "upload_date": v.get("date", ""),
@@ -220,50 +518,57 @@ async def search_videos(topic: str, max_results: int = 5) -> list[dict]:
     core_topic = _extract_core_subject(topic)
 
     # Pexels first (downloadable stock B-roll), then YouTube/Serper for discovery
-    tasks = [
+    searches = [
         search_pexels_videos(core_topic, max_results=4),          # Stock B-roll (downloadable)
         search_youtube(f"{core_topic} demo", max_results=3),
         search_youtube(f"{core_topic} tutorial walkthrough", max_results=2),
         search_serper_videos(f"{core_topic} demo screen recording", max_results=3),
     ]
 
-    raw_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    all_videos = []
-    for result in raw_results:
-        if isinstance(result, list):
-            all_videos.extend(result)
-
-    # Deduplicate by video_id or similar title
-    seen_ids = set()
-    seen_titles = set()
-    unique = []
-    for v in all_videos:
-        vid = v.get("video_id", "")
-        title_key = re.sub(r'[^a-z0-9]', '', v["title"].lower())[:40]
-        if vid and vid in seen_ids:
-            continue
-        if title_key in seen_titles:
+    # Each strategy fills its own slot under its own deadline, so one slow
+    # or failing source leaves an empty slot instead of holding up the rest
+    raw_results: list[list[dict]] = [[] for _ in searches]
+
+    async def _run(i: int, search) -> None:
+        try:
+            async with asyncio.timeout(SEARCH_TASK_TIMEOUT):
+                raw_results[i] = await search
+        except TimeoutError:
+            logger.warning("Video search strategy %d timed out for: %s", i, core_topic)
+        except Exception as e:
+            logger.error("Video search strategy %d error: %s", i, e)
+
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(_run(i, search)) for i, search in enumerate(searches)]
+        # Serper is the supplementary discovery source: once the two YouTube
+        # queries alone bring enough distinct non-news candidates, stop
+        # waiting on it
+        *primary, serper_task = tasks
+        await asyncio.wait(primary)
+        usable = sum(1 for _, is_news in _distinct_candidates(raw_results[1:-1]) if not is_news)
+        if usable >= max_results:
+            serper_task.cancel()
+
+    # One pass over the deduped candidates: set news channels aside and keep
+    # a bounded min-heap of the top-K by B-roll usability score.
+    # (score, -index) ordering keeps search order on ties.
+    top = []
+    news_only = []
+    for index, (v, is_news) in enumerate(_distinct_candidates(raw_results), 1):
+        if is_news:
+            news_only.append(v)
             continue
-        seen_ids.add(vid)
-        seen_titles.add(title_key)
-        unique.append(v)
-
-    # Filter out news channels
-    filtered = [v for v in unique if not _is_news_channel(v.get("channel", ""))]
+        entry = (_compute_broll_score(v), -index, v)
+        if len(top) < max_results:
+            heapq.heappush(top, entry)
+        elif entry > top[0]:
+            heapq.heapreplace(top, entry)
 
     # If filtering removed everything, keep originals but deprioritize news
-    if not filtered and unique:
-        filtered = unique
+    if not top and news_only:
+        return heapq.nlargest(max_results, news_only, key=_compute_broll_score)
 
-    # Score each video for B-roll usability
-    scored = []
-    for v in filtered:
-        score = _compute_broll_score(v)
-        scored.append((score, v))
-
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [v for _, v in scored[:max_results]]
+    return [v for _, _, v in sorted(top, reverse=True)]
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -271,7 +576,7 @@ async def search_videos(topic: str, max_results: int = 5) -> list[dict]:
 # ═══════════════════════════════════════════════════════════════════
 async def download_video(url: str, max_duration: int = MAX_VIDEO_DURATION) -> Optional[dict]:
     """Download video to temp file using yt-dlp. Returns file info dict."""
-    tmp_dir = tempfile.mkdtemp(prefix="ajvideo_")
+    tmp_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="ajvideo_")
     output_template = os.path.join(tmp_dir, "%(title).50s.%(ext)s")
 
     cmd = [
@@ -288,36 +593,47 @@ async def download_video(url: str, max_duration: int = MAX_VIDEO_DURATION) -> Op
         "--no-check-certificates",
         "--geo-bypass",
         "--add-header", "Accept-Language:en-US,en;q=0.9",
+        # Print the final path once the file is in place (implies --quiet),
+        # so we never have to scan tmp_dir for it
+        "--print", "after_move:filepath",
         "--output", output_template,
     ]
     cmd.append(url)
 
     try:
+        # Drain both pipes as they are written, keeping just their heads,
+        # instead of buffering the logs until exit
         proc = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,  # own process group, so a timeout kills any ffmpeg child too
         )
-        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=180)
+        try:
+            stdout, stderr = await asyncio.wait_for(_drain_and_wait(proc), timeout=180)
+        except asyncio.TimeoutError:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            await proc.wait()
+            raise
 
         if proc.returncode != 0:
-            err_msg = stderr.decode()[:800]
+            err_msg = stderr.decode(errors="replace")[:800]
             logger.error("yt-dlp download failed (code %d): %s", proc.returncode, err_msg)
             return {"_error": err_msg}  # Return error details for caller
 
-        # Find the downloaded file
-        downloaded = None
-        for f in os.listdir(tmp_dir):
-            if f.endswith((".mp4", ".webm", ".mov", ".mkv")):
-                downloaded = os.path.join(tmp_dir, f)
-                break
-
-        if not downloaded or not os.path.exists(downloaded):
+        # The last printed line is the final file path; nothing is printed
+        # when yt-dlp skipped the download (e.g. over --max-filesize)
+        lines = stdout.strip().splitlines()
+        if not lines:
             logger.error("No video file found after download")
             return None
 
-        size_mb = os.path.getsize(downloaded) / (1024 * 1024)
+        filepath = os.fsdecode(lines[-1].strip())
+        size_mb = (await asyncio.to_thread(os.path.getsize, filepath)) / (1024 * 1024)
         return {
-            "filepath": downloaded,
-            "filename": os.path.basename(downloaded),
+            "filepath": filepath,
+            "filename": os.path.basename(filepath),
             "size_mb": round(size_mb, 2),
             "tmp_dir": tmp_dir,
         }
@@ -333,8 +649,11 @@ async def download_video(url: str, max_duration: int = MAX_VIDEO_DURATION) -> Op
 # ═══════════════════════════════════════════════════════════════════
 #  5. UPLOAD TO SUPABASE STORAGE
 # ═══════════════════════════════════════════════════════════════════
-async def upload_to_supabase(filepath: str, filename: str = None) -> Optional[str]:
-    """Upload video file to Supabase Storage, return public URL."""
+async def upload_to_supabase(filepath: str, filename: str = None,
+                             date_prefix: Optional[str] = None) -> Optional[str]:
+    """Upload video file to Supabase Storage, return public URL.
+    `date_prefix` overrides the 'YYYY/MM/DD' folder (batch callers pass one
+    for the whole batch)."""
     if not SUPABASE_URL or not SUPABASE_KEY:
         logger.warning("Supabase credentials not set — skipping upload")
         return None
@@ -342,31 +661,44 @@ async def upload_to_supabase(filepath: str, filename: str = None) -> Optional[st
     if not filename:
         filename = os.path.basename(filepath)
 
+    # Stream the file instead of reading up to MAX_VIDEO_SIZE_MB into memory;
+    # an explicit Content-Length keeps it a plain (non-chunked) upload
+    try:
+        size = await asyncio.to_thread(os.path.getsize, filepath)
+    except OSError as e:
+        logger.error("Supabase upload error: %s", e)
+        return None
+    return await _upload_stream(_iter_file(filepath), filename, size, date_prefix=date_prefix)
+
+
+async def _upload_stream(content, filename: str, size: Optional[int],
+                         timeout: float = 120, date_prefix: Optional[str] = None) -> Optional[str]:
+    """POST an async byte stream to Supabase Storage under a dated, unique
+    path and return its public URL. `size` sets Content-Length; pass None
+    when unknown to send it chunked."""
     # Clean filename + add unique prefix
-    safe_name = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
-    storage_path = f"{datetime.utcnow().strftime('%Y/%m/%d')}/{uuid.uuid4().hex[:8]}_{safe_name}"
+    safe_name = filename.translate(_SAFE_NAME_TABLE)
+    storage_path = f"{date_prefix or _date_prefix()}/{os.urandom(4).hex()}_{safe_name}"
 
     upload_url = f"{SUPABASE_URL}/storage/v1/object/{SUPABASE_BUCKET}/{storage_path}"
+    headers = {
+        "apikey": SUPABASE_KEY,
+        "Authorization": f"Bearer {SUPABASE_KEY}",
+        "Content-Type": mimetypes.guess_type(filename)[0] or "video/mp4",
+        "x-upsert": "true",
+    }
+    if size is not None:
+        headers["Content-Length"] = str(size)
 
     try:
-        with open(filepath, "rb") as f:
-            file_data = f.read()
-
-        async with httpx.AsyncClient(timeout=120) as client:
-            resp = await client.post(
-                upload_url,
-                headers={
-                    "apikey": SUPABASE_KEY,
-                    "Authorization": f"Bearer {SUPABASE_KEY}",
-                    "Content-Type": "video/mp4",
-                    "x-upsert": "true",
-                },
-                content=file_data,
-            )
-            resp.raise_for_status()
+        resp = await _get_client().post(upload_url, headers=headers, content=content, timeout=timeout)
+        resp.raise_for_status()
 
         public_url = f"{SUPABASE_URL}/storage/v1/object/public/{SUPABASE_BUCKET}/{storage_path}"
-        logger.info("Uploaded to Supabase: %s (%.1f MB)", storage_path, len(file_data)/(1024*1024))
+        if size is not None:
+            logger.info("Uploaded to Supabase: %s (%.1f MB)", storage_path, size/(1024*1024))
+        else:
+            logger.info("Uploaded to Supabase: %s", storage_path)
         return public_url
 
     except Exception as e:
@@ -379,17 +711,16 @@ async def upload_to_supabase(filepath: str, filename: str = None) -> Optional[st
 # ═══════════════════════════════════════════════════════════════════
 async def download_direct_mp4(url: str) -> Optional[dict]:
     """Download a direct MP4 URL via httpx (no yt-dlp). Used for Pexels."""
-    tmp_dir = tempfile.mkdtemp(prefix="ajvideo_")
-    filename = f"{uuid.uuid4().hex[:8]}.mp4"
+    tmp_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="ajvideo_")
+    filename = f"{os.urandom(4).hex()}.mp4"
     filepath = os.path.join(tmp_dir, filename)
     try:
-        async with httpx.AsyncClient(timeout=180, follow_redirects=True) as client:
-            async with client.stream("GET", url) as resp:
-                resp.raise_for_status()
-                with open(filepath, "wb") as f:
-                    async for chunk in resp.aiter_bytes(chunk_size=1024 * 64):
-                        f.write(chunk)
-        size_mb = os.path.getsize(filepath) / (1024 * 1024)
+        async with _get_client().stream("GET", url, timeout=180, follow_redirects=True) as resp:
+            resp.raise_for_status()
+            with open(filepath, "wb") as f:
+                async for chunk in resp.aiter_bytes(chunk_size=1024 * 64):
+                    f.write(chunk)
+        size_mb = (await asyncio.to_thread(os.path.getsize, filepath)) / (1024 * 1024)
         if size_mb > MAX_VIDEO_SIZE_MB:
             return {"_error": f"File is {size_mb:.1f}MB, exceeds {MAX_VIDEO_SIZE_MB}MB limit."}
         return {"filepath": filepath, "filename": filename, "size_mb": round(size_mb, 2), "tmp_dir": tmp_dir}
@@ -398,12 +729,53 @@ async def download_direct_mp4(url: str) -> Optional[dict]:
         return None
 
 
-async def select_and_host_video(video_url: str, download_url: str = "") -> dict:
+async def relay_direct_mp4(url: str, date_prefix: Optional[str] = None) -> Optional[dict]:
+    """Stream a direct MP4 URL straight into Supabase Storage: the upload
+    starts with the first downloaded chunk and nothing touches disk. Used
+    for Pexels when Supabase is configured."""
+    filename = f"{os.urandom(4).hex()}.mp4"
+    limit = MAX_VIDEO_SIZE_MB * 1024 * 1024
+    received = 0
+
+    async def _capped(chunks):
+        nonlocal received
+        async for chunk in chunks:
+            received += len(chunk)
+            if received > limit:
+                raise ValueError(f"download exceeds {MAX_VIDEO_SIZE_MB}MB")
+            yield chunk
+
+    try:
+        async with _get_client().stream("GET", url, timeout=180, follow_redirects=True) as resp:
+            resp.raise_for_status()
+            # Content-Length only describes the decoded body when there is
+            # no content-encoding; otherwise upload chunked
+            length = None
+            if "content-encoding" not in resp.headers and resp.headers.get("content-length"):
+                length = int(resp.headers["content-length"])
+                if length > limit:
+                    return {"_error": f"File is {length / (1024 * 1024):.1f}MB, exceeds {MAX_VIDEO_SIZE_MB}MB limit."}
+            public_url = await _upload_stream(
+                _capped(resp.aiter_bytes(chunk_size=1024 * 64)), filename, length,
+                timeout=180, date_prefix=date_prefix,
+            )
+    except Exception as e:
+        logger.error("Direct MP4 relay error: %s", e)
+        return None
+
+    if received > limit:
+        return {"_error": f"File exceeds {MAX_VIDEO_SIZE_MB}MB limit."}
+    return {"filename": filename, "size_mb": round(received / (1024 * 1024), 2), "public_url": public_url}
+
+
+async def select_and_host_video(video_url: str, download_url: str = "",
+                                date_prefix: Optional[str] = None) -> dict:
     """Download a selected video and upload to Supabase for permanent hosting.
 
     Routing logic:
     - YouTube URLs → blocked (YouTube now requires browser auth for server downloads)
-    - Pexels/direct MP4 URLs (download_url) → direct httpx download
+    - Pexels/direct MP4 URLs (download_url) → streamed straight into the
+      Supabase upload (direct httpx download if Supabase isn't configured)
     - Other platforms → yt-dlp attempt
     """
     result = {"status": "error", "url": video_url, "supabase_url": None, "error": None}
@@ -421,7 +793,9 @@ async def select_and_host_video(video_url: str, download_url: str = "") -> dict:
     # ── Pexels or other direct MP4 URL ──
     effective_url = download_url if download_url else video_url
     is_direct_mp4 = effective_url.endswith(".mp4") or "pexels.com/video-files" in effective_url or download_url
-    if is_direct_mp4:
+    if is_direct_mp4 and SUPABASE_URL and SUPABASE_KEY:
+        dl = await relay_direct_mp4(effective_url, date_prefix)
+    elif is_direct_mp4:
         dl = await download_direct_mp4(effective_url)
     else:
         dl = await download_video(effective_url)
@@ -436,28 +810,222 @@ async def select_and_host_video(video_url: str, download_url: str = "") -> dict:
     result["local_file"] = dl["filename"]
     result["size_mb"] = dl["size_mb"]
 
-    # Upload to Supabase
-    public_url = await upload_to_supabase(dl["filepath"], dl["filename"])
+    # Upload to Supabase (already done if the download was relayed)
+    if "public_url" in dl:
+        public_url = dl["public_url"]
+    else:
+        public_url = await upload_to_supabase(dl["filepath"], dl["filename"], date_prefix)
     if public_url:
         result["status"] = "success"
         result["supabase_url"] = public_url
     else:
-        result["status"] = "downloaded"
+        result["status"] = "downloaded" if "filepath" in dl else "error"
         result["error"] = "Upload to Supabase failed — check credentials."
 
-    # Cleanup temp file
-    try:
-        import shutil
-        shutil.rmtree(dl["tmp_dir"], ignore_errors=True)
-    except Exception:
-        pass
+    # Cleanup temp file (off the event loop — rmtree is one syscall per entry)
+    if "tmp_dir" in dl:
+        await asyncio.to_thread(shutil.rmtree, dl["tmp_dir"], ignore_errors=True)
 
     return result
 
 
+async def select_and_host_videos(videos: list[dict], concurrency: int = 4) -> list[dict]:
+    """Run select_and_host_video for several picks at once, at most
+    `concurrency` download/upload pipelines in flight. Each item needs "url"
+    and may carry "download_url" (as returned by search_videos). Results
+    come back in input order. The whole batch lands in one dated folder."""
+    sem = asyncio.Semaphore(concurrency)
+    date_prefix = _date_prefix()
+
+    async def _one(video: dict) -> dict:
+        async with sem:
+            return await select_and_host_video(
+                video.get("url", ""), video.get("download_url", ""), date_prefix,
+            )
+
+    return await asyncio.gather(*(_one(v) for v in videos))
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  7. HOSTED VIDEO CACHE — repeat topics skip the whole pipeline
+# ═══════════════════════════════════════════════════════════════════
+# The video hosted for a topic is recorded in a Supabase table (through the
+# PostgREST API), keyed on a hash of the normalized topic. Expected table:
+#
+#   create table hosted_videos (
+#     topic_hash   text primary key,   -- sha1 of the normalized topic
+#     topic        text not null,
+#     url          text not null,      -- source page of the hosted video
+#     title        text,
+#     supabase_url text not null,
+#     created_at   timestamptz not null default now()
+#   );
+async def get_or_create_hosted_video(topic: str) -> dict:
+    """Return a hosted video for a topic. A video hosted for the same topic
+    within HOSTED_VIDEO_TTL_DAYS is returned straight from the cache table;
+    otherwise search, host the best candidate that downloads, and record it."""
+    result = {"status": "error", "topic": topic, "url": None, "title": None,
+              "supabase_url": None, "cached": False, "error": None}
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        result["error"] = "Supabase credentials not set."
+        return result
+
+    topic_hash = hashlib.sha1(" ".join(topic.lower().split()).encode()).hexdigest()
+    cached = await _lookup_hosted_video(topic_hash)
+    if cached:
+        result.update(status="success", url=cached["url"], title=cached.get("title"),
+                      supabase_url=cached["supabase_url"], cached=True)
+        return result
+
+    # YouTube downloads are blocked (see select_and_host_video) — don't try them
+    candidates = [v for v in await search_videos(topic) if v["platform"] != "YouTube"]
+    if not candidates:
+        result["error"] = "No downloadable videos found for this topic."
+        return result
+
+    for video in candidates:
+        hosted = await select_and_host_video(video["url"], video.get("download_url", ""))
+        if hosted["status"] == "success":
+            await _store_hosted_video(topic_hash, topic, video, hosted["supabase_url"])
+            result.update(status="success", url=video["url"], title=video["title"],
+                          supabase_url=hosted["supabase_url"], error=None)
+            return result
+        result["error"] = hosted["error"]
+    return result
+
+
+def _rest_headers() -> dict:
+    return {
+        "apikey": SUPABASE_KEY,
+        "Authorization": f"Bearer {SUPABASE_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+async def _lookup_hosted_video(topic_hash: str) -> Optional[dict]:
+    """Fresh cache row for a topic hash, or None. A failed lookup is a miss."""
+    cutoff = time.strftime("%Y-%m-%dT%H:%M:%SZ",
+                           time.gmtime(time.time() - HOSTED_VIDEO_TTL_DAYS * 86400))
+    try:
+        resp = await _get_client().get(
+            f"{SUPABASE_URL}/rest/v1/{SUPABASE_VIDEO_CACHE_TABLE}",
+            headers=_rest_headers(),
+            params={
+                "topic_hash": f"eq.{topic_hash}",
+                "created_at": f"gte.{cutoff}",
+                "select": "url,title,supabase_url",
+                "limit": "1",
+            },
+        )
+        resp.raise_for_status()
+        rows = orjson.loads(resp.content)
+    except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+        logger.warning("Hosted video cache lookup failed: %s", e)
+        return None
+    return rows[0] if rows else None
+
+
+async def _store_hosted_video(topic_hash: str, topic: str, video: dict, supabase_url: str) -> None:
+    """Upsert the cache row for a topic. Failures are logged, not raised —
+    the video is already hosted either way."""
+    row = {
+        "topic_hash": topic_hash,
+        "topic": topic,
+        "url": video["url"],
+        "title": video.get("title", ""),
+        "supabase_url": supabase_url,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    try:
+        resp = await _get_client().post(
+            f"{SUPABASE_URL}/rest/v1/{SUPABASE_VIDEO_CACHE_TABLE}",
+            headers={**_rest_headers(), "Prefer": "resolution=merge-duplicates,return=minimal"},
+            content=orjson.dumps(row),
+        )
+        resp.raise_for_status()
+    except httpx.HTTPError as e:
+        logger.warning("Hosted video cache write failed: %s", e)
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  HELPERS
 # ═══════════════════════════════════════════════════════════════════
+def _pick_pexels_file(files: list[dict]) -> Optional[dict]:
+    """Pick the widest MP4 rendition ≤1080p (1920 wide), else the widest MP4
+    of any size — one pass over the variants, no sort."""
+    best, best_w = None, -1
+    fallback, fallback_w = None, -1
+    for f in files:
+        if f.get("file_type") != "video/mp4":
+            continue
+        w = f.get("width", 0)
+        if w > fallback_w:
+            fallback, fallback_w = f, w
+        if w <= 1920 and w > best_w:
+            best, best_w = f, w
+    return best or fallback
+
+_date_cache = {"day": -1, "prefix": ""}
+
+def _date_prefix() -> str:
+    """UTC 'YYYY/MM/DD' for storage paths, formatted once per UTC day."""
+    now = time.time()
+    day = int(now // 86400)
+    if day != _date_cache["day"]:
+        _date_cache["prefix"] = time.strftime("%Y/%m/%d", time.gmtime(now))
+        _date_cache["day"] = day
+    return _date_cache["prefix"]
+
+async def _read_head(stream: asyncio.StreamReader, keep: int = 4096) -> bytes:
+    """Read a child's pipe to EOF as it is written (so the child never blocks
+    on a full pipe) and return the first `keep` bytes."""
+    head = bytearray()
+    while chunk := await stream.read(64 * 1024):
+        if len(head) < keep:
+            head += chunk[:keep - len(head)]
+    return bytes(head)
+
+async def _drain_and_wait(proc: asyncio.subprocess.Process) -> tuple[bytes, bytes]:
+    """Drain a child's stdout and stderr together, then wait for exit."""
+    stdout, stderr = await asyncio.gather(_read_head(proc.stdout), _read_head(proc.stderr))
+    await proc.wait()
+    return stdout, stderr
+
+async def _iter_file(filepath: str, chunk_size: int = 1024 * 1024):
+    """Yield a file in chunks, doing the blocking reads off the event loop."""
+    with open(filepath, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, chunk_size):
+            yield chunk
+
+def _distinct_candidates(results: list[list[dict]]):
+    """Yield (video, is_news_channel) for each search result, in order,
+    skipping repeats by video_id or near-duplicate title."""
+    seen_ids = set()
+    seen_titles: list[int] = []  # SimHashes of accepted titles
+    for result in results:
+        for v in result:
+            vid = v.get("video_id", "")
+            if vid and vid in seen_ids:
+                continue
+            # Reworded / reordered titles ("iPhone 15 Pro Review" vs
+            # "Review: iPhone 15 Pro!") land within a few bits of each other
+            title_hash = _simhash(v["title"])
+            if any((title_hash ^ h).bit_count() <= SIMHASH_MAX_DISTANCE for h in seen_titles):
+                continue
+            seen_ids.add(vid)
+            seen_titles.append(title_hash)
+            yield v, _is_news_channel(v.get("channel_lc", ""))
+
+def _simhash(title: str) -> int:
+    """64-bit SimHash of a title's lowercase word tokens: each token's hash
+    votes on every bit, and the sign of each vote total becomes the bit."""
+    votes = [0] * 64
+    for token in title.lower().translate(_TOKEN_TABLE).split():
+        h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+        for bit in range(64):
+            votes[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if votes[bit] > 0)
+
 def _format_views(count: int) -> str:
     if count >= 1_000_000:
         return f"{count/1_000_000:.1f}M views"
@@ -467,59 +1035,54 @@ def _format_views(count: int) -> str:
         return f"{count} views"
     return ""
 
+@functools.lru_cache(maxsize=2048)
 def _detect_platform(url: str) -> str:
-    url_lower = url.lower()
-    if "youtube.com" in url_lower or "youtu.be" in url_lower:
-        return "YouTube"
-    if "twitter.com" in url_lower or "x.com" in url_lower:
-        return "Twitter/X"
-    if "vimeo.com" in url_lower:
-        return "Vimeo"
-    if "tiktok.com" in url_lower:
-        return "TikTok"
-    if "dailymotion.com" in url_lower:
-        return "Dailymotion"
-    return "Web"
+    # One dict lookup on the registered domain (last two hostname labels),
+    # so "m.youtube.com" matches but "netflix.com" no longer reads as x.com
+    try:
+        host = urlsplit(url).hostname or ""
+    except ValueError:  # malformed link, e.g. "http://[bad"
+        return "Web"
+    return _PLATFORM_BY_DOMAIN.get(".".join(host.rsplit(".", 2)[-2:]), "Web")
 
+@functools.lru_cache(maxsize=2048)
 def _extract_video_id(url: str) -> str:
-    yt_match = re.search(r'(?:v=|youtu\.be/)([a-zA-Z0-9_-]{11})', url)
+    yt_match = _YT_ID_RE.search(url)
     if yt_match:
         return yt_match.group(1)
     return url.split("/")[-1].split("?")[0][:20]
 
+@functools.lru_cache(maxsize=2048)
 def _parse_duration(dur_str: str) -> int:
     """Parse duration strings like '3:45' or '1:02:30' into seconds."""
     if not dur_str or dur_str == "?":
         return 0
-    parts = dur_str.strip().split(":")
+    # rpartition instead of split: no list for the common "M:SS" case
+    head, sep, secs = dur_str.strip().rpartition(":")
     try:
-        if len(parts) == 3:
-            return int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-        if len(parts) == 2:
-            return int(parts[0]) * 60 + int(parts[1])
-        return int(parts[0])
-    except (ValueError, IndexError):
+        if not sep:
+            return int(secs)
+        hours, hsep, mins = head.rpartition(":")
+        total = int(mins) * 60 + int(secs)
+        if hsep:
+            total += int(hours) * 3600
+        return total
+    except ValueError:
         return 0
 
-def _is_news_channel(channel: str) -> bool:
-    """Check if a channel is in the TV news blocklist."""
-    return channel.strip().lower() in NEWS_CHANNELS_BLOCKLIST
+def _is_news_channel(channel_lc: str) -> bool:
+    """Check if a (lowercased) channel name contains a TV news blocklist entry."""
+    return _NEWS_CHANNEL_RE.search(channel_lc) is not None
 
+@functools.lru_cache(maxsize=1024)
 def _extract_core_subject(topic: str) -> str:
     """Extract the core product/company/tool name from a topic title.
     E.g. 'Anthropic just rejected the Pentagon' -> 'Anthropic Pentagon AI'
     E.g. 'China\\'s new model beating GPT 5.2' -> 'China AI model GPT'
     """
     # Remove common filler words to get the searchable core
-    filler = {"just", "the", "this", "that", "is", "are", "was", "were", "has", "have",
-              "had", "been", "being", "a", "an", "of", "in", "on", "for", "to", "and",
-              "but", "or", "so", "yet", "with", "from", "by", "at", "it", "its",
-              "might", "could", "would", "should", "will", "can", "may", "do", "does",
-              "did", "not", "all", "very", "really", "here", "there", "now", "new",
-              "just", "out", "about", "how", "what", "when", "where", "who", "why",
-              "every", "some", "any", "no", "only", "own", "your", "our", "my"}
-    words = re.sub(r'[^\w\s]', ' ', topic).split()
-    core = [w for w in words if w.lower() not in filler and len(w) > 1]
+    words = _PUNCT_RE.sub(' ', topic).split()
+    core = [w for w in words if len(w) > 1 and w.lower() not in _FILLER]
     # Keep max 5 core words to make a focused query
     result = " ".join(core[:5])
     return result if result else topic
@@ -530,70 +1093,41 @@ def _compute_broll_score(video: dict) -> float:
     Lower = more likely to be news coverage / talking heads."""
     score = 0.0
     title = (video.get("title") or "").lower()
-    channel = (video.get("channel") or "").lower()
+    channel = video.get("channel_lc")
+    if channel is None:
+        channel = (video.get("channel") or "").strip().lower()
     desc = (video.get("description") or "").lower()
     duration = video.get("duration") or 0
     views = video.get("views") or 0
     text = title + " " + desc
+    has_keywords = _TEXT_KEYWORD_RE.search(text) is not None
 
     # ── BOOST: Demo/tutorial/screen recording indicators ──
-    demo_words = ["demo", "tutorial", "walkthrough", "how to", "screen recording",
-                  "hands on", "hands-on", "first look", "getting started",
-                  "overview", "features", "introduction", "intro to",
-                  "using", "setup", "guide", "showcase", "preview"]
-    for w in demo_words:
-        if w in text:
-            score += 200
+    if has_keywords:
+        score += 200 * len(_scan_demo_words(text))
 
     # ── BOOST: Official product channels ──
-    official_channels = ["google", "openai", "anthropic", "microsoft", "apple",
-                        "nvidia", "meta", "amazon", "hugging face", "stability ai",
-                        "midjourney", "runway", "google deepmind", "google ai"]
-    for ch in official_channels:
-        if ch in channel:
-            score += 300
-            break
+    if _OFFICIAL_RE.search(channel):
+        score += 300
 
     # ── BOOST: Tech creator channels (not news) ──
-    creator_words = ["matt wolfe", "fireship", "two minute papers", "ai explained",
-                     "all about ai", "matt vdm", "corbin brown", "riley brown",
-                     "web dev simplified", "theo", "coding in flow"]
-    for cw in creator_words:
-        if cw in channel:
-            score += 150
-            break
+    if _CREATOR_RE.search(channel):
+        score += 150
 
     # ── BOOST: Short videos (ideal for B-roll, under 3 min) ──
-    if 0 < duration <= 60:
-        score += 250  # Under 1 min = perfect for shorts
-    elif 60 < duration <= 180:
-        score += 200  # 1-3 min = great
-    elif 180 < duration <= 300:
-        score += 100  # 3-5 min = okay
-    elif 300 < duration <= 600:
-        score += 0    # 5-10 min = meh
-    elif duration > 600:
-        score -= 200  # Over 10 min = probably not B-roll
+    score += _DURATION_SCORES[bisect.bisect_left(_DURATION_BOUNDS, duration)]
 
     # ── PENALIZE: News coverage indicators ──
-    news_words = ["breaking news", "breaking:", "live:", "exclusive:",
-                  "report", "reporting", "anchor", "coverage", "interview",
-                  "panel discussion", "press conference", "testimony",
-                  "hearing", "committee", "correspondent", "analysis"]
-    for w in news_words:
-        if w in text:
-            score -= 300
+    if has_keywords:
+        score -= 300 * len(_scan_news_words(text))
 
     # ── PENALIZE: News channels that slipped through blocklist ──
-    if _is_news_channel(video.get("channel", "")):
+    if _is_news_channel(channel):
         score -= 500
 
     # ── PENALIZE: News-like channel patterns ──
-    news_patterns = ["news", "tv", "television", "broadcast", "daily", "times",
-                     "post", "journal", "herald", "tribune", "gazette"]
-    for p in news_patterns:
-        if p in channel and channel not in {"product hunt", "hacker news"}:
-            score -= 150
+    if channel not in NEWS_PATTERN_EXEMPT:
+        score -= 150 * len(_scan_news_patterns(channel))
 
     # ── Small view count boost (some signal, not dominant) ──
     if views > 0: